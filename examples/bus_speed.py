@@ -0,0 +1,47 @@
+"""
+bus_speed.py
+
+    Measures the data bus throughput of fill_rect and blit_buffer in bytes
+    per second, with the data bus statistics counted in a second pass.
+
+"""
+
+import random
+import time
+import wt32sc01py as wt32
+
+
+def measure(name, draw, size):
+    """Time draw and print the bytes per second it sends."""
+    start = time.ticks_us()
+    draw()
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    print(f"{name}: {size * 1000000 // elapsed} bytes/s")
+
+
+def main():
+    tft = wt32.WT32SC01(0)
+    width, height = 240, 80
+    size = width * height * 2
+    buffer = bytearray(random.getrandbits(8) for _ in range(size))
+    colors = (wt32.BLUE, wt32.WHITE, 0x1234)
+
+    for counting in (False, True):
+        tft.count_stats(counting)
+        for color in colors:
+            measure(
+                f"fill_rect {color:04x}",
+                lambda: tft.fill_rect(0, 0, width, height, color),
+                size,
+            )
+
+        measure(
+            "blit_buffer", lambda: tft.blit_buffer(buffer, 0, 0, width, height), size
+        )
+        if counting:
+            print(tft.stats(True))
+
+    tft.count_stats(False)
+
+
+main()
@@ -0,0 +1,33 @@
+"""
+console.py
+
+    Streams colored log lines to a hardware scrolled console on the display.
+
+"""
+from machine import freq
+import random
+import wt32sc01py as wt32
+import console
+import vga1_8x16 as font
+
+LEVELS = (
+    ("\x1b[32mINFO\x1b[0m", "all systems nominal"),
+    ("\x1b[33mWARN\x1b[0m", "temperature rising"),
+    ("\x1b[1;31mFAIL\x1b[0m", "coolant pump stalled"),
+    ("\x1b[36mDBUG\x1b[0m", "sensor read complete"),
+)
+
+
+def main():
+    tft = wt32.WT32SC01(0)
+    con = console.Console(tft, font)
+
+    count = 0
+    while True:
+        level, message = random.choice(LEVELS)
+        print("{:6d} {} {}".format(count, level, message), file=con)
+        count += 1
+
+
+freq(240_000_000)
+main()
@@ -0,0 +1,55 @@
+"""
+dashboard.py
+
+    A dashboard of simulated readings updated ten times a second with
+    widgets, only the parts of the widgets that change are drawn.
+
+"""
+
+from machine import freq
+import random
+import utime
+import wt32sc01py as wt32
+import widgets
+import vga1_8x16 as small
+import vga2_bold_16x32 as large
+
+
+def main():
+    tft = wt32.WT32SC01(1)
+    tft.clear()
+
+    screen = widgets.Screen(tft)
+    screen.add(widgets.Label(small, 20, 20, 200, "Engine speed"))
+    rpm = screen.add(widgets.Readout(large, 20, 40, 200, fmt="{:d} rpm"))
+    gauge = screen.add(widgets.Gauge(20, 90, 200, 100, wt32.YELLOW, maximum=8000))
+    screen.add(widgets.Label(small, 260, 20, 200, "Fuel"))
+    fuel = screen.add(widgets.Bar(260, 40, 200, 24, wt32.GREEN, value=100))
+    screen.add(widgets.Label(small, 260, 90, 200, "Coolant"))
+    coolant = screen.add(
+        widgets.Readout(large, 260, 110, 200, fmt="{:.1f} C", fg=wt32.CYAN)
+    )
+    status = screen.add(widgets.Button(small, 20, 240, 440, 40, "Status OK", radius=8))
+
+    speed = 800
+    level = 100.0
+    temperature = 80.0
+    while True:
+        speed = min(max(speed + random.randint(-200, 200), 800), 8000)
+        level = max(level - 0.02, 0)
+        temperature = min(max(temperature + random.uniform(-0.5, 0.5), 60), 120)
+
+        rpm.set_value(speed)
+        gauge.set_value(speed)
+        fuel.set_value(level)
+        coolant.set_value(temperature)
+        overheated = temperature > 100
+        status.set_text("Overheating" if overheated else "Status OK")
+        status.set_pressed(overheated)
+
+        screen.refresh()
+        utime.sleep(0.1)
+
+
+freq(240_000_000)
+main()
@@ -10,6 +10,7 @@ import math
 import utime
 from machine import freq
 import wt32sc01py as wt32
+from viewport import Viewport
 
 
 def between(left, right, along):
@@ -44,14 +45,9 @@ def main():
     height = tft.height  # height of display in pixels
     width = tft.width  # width if display in pixels
 
-    tfa = 0  # top free area when scrolling
-    bfa = 0  # bottom free area when scrolling
-
-    scroll = 0  # scroll position
     wheel = 0  # color wheel position
 
-    tft.vscrdef(tfa, width, bfa)  # set scroll area
-    tft.vscsad(scroll + tfa)  # set scroll position
+    view = Viewport(tft)  # scroll the whole display
     tft.clear()  # clear screen
 
     half = (height >> 1) - 1  # half the height of the dislay
@@ -77,24 +73,19 @@ def main():
             interval = random.randint(10, 100)
             increment = 1 / interval  # increment per step
 
-        # clear the first column of the display and scroll it
-        tft.vline(scroll, 0, height, wt32.BLACK)
-        tft.vscsad(scroll + tfa)
+        # clear the first column of the display and scroll it to the end
+        view.vline(0, 0, height, wt32.BLACK)
+        view.scroll(1)
 
         # get the next point between last_y and current_y
         tween = int(between(last_y, current_y, counter * increment))
 
         # draw mirrored pixels across the display at the offsets using the color_wheel effect
         for i, x_offset in enumerate(x_offsets):
-            tft.pixel(
-                (scroll + x_offset) % width, half + tween, color_wheel(wheel + (i << 2))
-            )
-            tft.pixel(
-                (scroll + x_offset) % width, half - tween, color_wheel(wheel + (i << 2))
-            )
-
-        # increment scroll, counter, and wheel
-        scroll = (scroll + 1) % width
+            view.pixel(x_offset, half + tween, color_wheel(wheel + (i << 2)))
+            view.pixel(x_offset, half - tween, color_wheel(wheel + (i << 2)))
+
+        # increment counter, and wheel
         wheel = (wheel + 1) % 256
         counter += 1
 
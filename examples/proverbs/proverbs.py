@@ -6,6 +6,7 @@ proverbs.py - Displays what I hope are chinese proverbs in simplified chinese to
 import utime
 from machine import freq
 import wt32sc01py as wt32
+import layout
 import proverbs_font as font
 
 
@@ -44,30 +45,25 @@ def main():
     ]
 
     # initialize display
-    line_height = font.HEIGHT + 8
-    half_height = tft.height // 2
-    half_width = tft.width // 2
+    box = layout.TextBox(
+        tft,
+        font,
+        0,
+        0,
+        tft.width,
+        tft.height,
+        align=layout.CENTER,
+        valign=layout.MIDDLE,
+        line_spacing=8,
+    )
     wheel = 0
 
     tft.clear()
 
     while True:
         for proverb in proverbs:
-            proverb_lines = proverb.split("，")
-            half_lines_height = len(proverb_lines) * line_height // 2
-
-            tft.clear()
-
-            for count, proverb_line in enumerate(proverb_lines):
-                half_length = tft.write_width(font, proverb_line) // 2
-
-                tft.write(
-                    font,
-                    proverb_line,
-                    half_width - half_length,
-                    half_height - half_lines_height + count * line_height,
-                    color_wheel(wheel),
-                )
+            box.fg = color_wheel(wheel)
+            box.draw("\n".join(proverb.split("，")))
 
             wheel = (wheel + 5) % 256
 
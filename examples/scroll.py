@@ -4,10 +4,12 @@ scroll.py
     Smoothly scrolls all font characters up the screen on the display.
 
 """
+
 from machine import freq
 import utime
 import random
 import wt32sc01py as wt32
+from viewport import Viewport
 
 # choose a font
 
@@ -25,32 +27,27 @@ def main():
     tft = wt32.WT32SC01(0)
     tft.clear()
 
+    view = Viewport(tft)
     last_line = tft.height - font.HEIGHT
-    tft.vscrdef(0, 320, 0)
 
-    scroll = 0
     character = 0
     while True:
-        tft.fill_rect(0, scroll, tft.width, 1, wt32.BLACK)
+        # scroll up a row and clear the row scrolled into view at the bottom
+        view.scroll(1)
+        view.hline(0, tft.height - 1, tft.width, wt32.BLACK)
 
-        if scroll % font.HEIGHT == 0:
-            tft.text(
+        if view.offset % font.HEIGHT == 0:
+            view.text(
                 font,
                 "0x{:02x}= {:s} ".format(character, chr(character)),
                 96,
-                (scroll + last_line) % tft.height,
+                last_line,
                 wt32.WHITE,
                 wt32.BLACK,
             )
 
             character = character + 1 if character < 256 else 0
 
-        tft.vscsad(scroll)
-        scroll += 1
-
-        if scroll == tft.height:
-            scroll = 0
-
         utime.sleep(0.01)
 
 
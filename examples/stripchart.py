@@ -0,0 +1,50 @@
+"""
+stripchart.py
+
+    Plots three noisy waves on a hardware scrolled strip chart with their
+    current values shown in a fixed area at the right of the display.
+
+"""
+
+from machine import freq
+import math
+import random
+import wt32sc01py as wt32
+from stripchart import StripChart
+import vga1_8x16 as font
+
+LEGEND = 80  # width of the fixed area for the current values
+COLORS = (wt32.RED, wt32.GREEN, wt32.CYAN)
+
+
+def main():
+    tft = wt32.WT32SC01(1)
+    tft.clear()
+    chart = StripChart(tft, COLORS, -100, 100, bfa=LEGEND)
+
+    angle = 0
+    sample = 0
+    while True:
+        values = (
+            70 * math.sin(angle) + random.randint(-5, 5),
+            50 * math.sin(angle * 3),
+            90 * math.cos(angle / 2) + random.randint(-10, 10),
+        )
+        chart.add(*values)
+
+        if sample % 16 == 0:
+            for index, value in enumerate(values):
+                tft.text(
+                    font,
+                    "{:4d}".format(int(value)),
+                    tft.width - LEGEND + 8,
+                    index * 2 * font.HEIGHT,
+                    COLORS[index],
+                )
+
+        angle += 0.05
+        sample += 1
+
+
+freq(240_000_000)
+main()
@@ -32,9 +32,9 @@ class toast:
         self.speed = random.randint(2, 5)
 
     def move(self):
-        if self.x <= 0:
+        if self.x <= -64:
             self.speed = random.randint(2, 5)
-            self.x = WIDTH - 64
+            self.x = WIDTH
 
         self.step += 1
         self.step %= self.steps
@@ -68,11 +68,7 @@ def main():
             )
 
             man.move()
-
-            if man.x > 0:
-                tft.bitmap(bitmap, man.x, man.y)
-            else:
-                tft.fill_rect(0, man.y, bitmap.WIDTH, bitmap.HEIGHT, wt32.BLACK)
+            tft.bitmap(bitmap, man.x, man.y)
 
 
 freq(240_000_000)
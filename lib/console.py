@@ -0,0 +1,340 @@
+"""
+console.py - A scrolling text console for the wt32sc01py driver.
+
+The console writes text in a rom font and scrolls using a Viewport of the
+display, so only the line scrolled into view is cleared. Rotations that the
+hardware can not scroll vertically fall back to redrawing the lines from the
+ring buffer of lines the console keeps.
+
+The ANSI escape sequences for colors (SGR), cursor movement (CUU, CUD, CUF,
+CUB, CUP), erasing (ED, EL) and showing or hiding the cursor are supported.
+The console is an io.IOBase stream with write and readinto methods, so it can
+be used with print or os.dupterm.
+
+Example:
+
+    console = Console(tft, vga1_8x16)
+    print("\\x1b[32mHello\\x1b[0m, World!", file=console)
+    os.dupterm(console)
+
+"""
+
+import io
+from array import array
+from wt32sc01py import WHITE, BLACK, color565
+from viewport import Viewport
+
+# ANSI colors 0 through 7 and the bright colors 8 through 15
+ANSI_COLORS = (
+    BLACK,
+    color565(170, 0, 0),
+    color565(0, 170, 0),
+    color565(170, 85, 0),
+    color565(0, 0, 170),
+    color565(170, 0, 170),
+    color565(0, 170, 170),
+    color565(170, 170, 170),
+    color565(85, 85, 85),
+    color565(255, 85, 85),
+    color565(85, 255, 85),
+    color565(255, 255, 85),
+    color565(85, 85, 255),
+    color565(255, 85, 255),
+    color565(85, 255, 255),
+    WHITE,
+)
+
+# palette indexes of the default colors, following the ANSI colors
+_DEFAULT_FG = 16
+_DEFAULT_BG = 17
+
+
+class Console(io.IOBase):
+    """
+    A text console stream using the full display.
+
+    Args:
+        tft (WT32SC01): display driver
+        font (module): rom font module or BinaryFont
+        fg (int): 565 encoded default text color, defaults to WHITE
+        bg (int): 565 encoded default background color, defaults to BLACK
+        cursor (bool): draw an underline cursor, defaults to True
+    """
+
+    def __init__(self, tft, font, fg=WHITE, bg=BLACK, cursor=True):
+        self.tft = tft
+        self.font = font
+        self.columns = tft.width // font.WIDTH
+        self.rows = tft.height // font.HEIGHT
+        self.palette = list(ANSI_COLORS) + [fg, bg]
+        self.cursor = cursor
+
+        self._text = [bytearray(b" " * self.columns) for _ in range(self.rows)]
+        self._attrs = [
+            array("H", [_DEFAULT_FG | _DEFAULT_BG << 8] * self.columns)
+            for _ in range(self.rows)
+        ]
+
+        axis, _ = tft.scroll_axis()
+        if axis:
+            self._view = None
+            self._screen = tft
+        else:
+            self._view = Viewport(tft, 0, tft.height - self.rows * font.HEIGHT)
+            self._screen = self._view
+
+        self._escape = None
+        self.clear()
+
+    def clear(self):
+        """Clear the console and move the cursor to the top left corner."""
+        self._top = 0
+        self.row = 0
+        self.column = 0
+        self._fg = _DEFAULT_FG
+        self._bg = _DEFAULT_BG
+        self._bold = False
+        self._pending = ""
+        for row in range(self.rows):
+            self._clear_line(row, 0, False)
+
+        self.tft.fill_rect(
+            0, 0, self.tft.width, self.tft.height, self.palette[_DEFAULT_BG]
+        )
+        if self._view is not None:
+            self._view.scroll_to(0)
+
+        self._show_cursor()
+
+    def write(self, data):
+        """
+        Write a string or bytes to the console, print and os.dupterm write
+        bytearrays.
+
+        Args:
+            data (str, bytes or bytearray): text and escape sequences to write
+
+        Returns:
+            int: number of characters or bytes written
+        """
+        if isinstance(data, str):
+            data = bytes(ord(char) if ord(char) < 256 else 0x3F for char in data)
+
+        self._hide_cursor()
+        for code in data:
+            if self._escape is not None:
+                self._escape_code(code)
+            elif code == 0x1B:
+                self._flush()
+                self._escape = ""
+            elif code == 0x0A:
+                self._newline()
+            elif code == 0x0D:
+                self._flush()
+                self.column = 0
+            elif code == 0x08:
+                self._flush()
+                self.column = max(0, self.column - 1)
+            elif code == 0x09:
+                self._put(0x20)
+                while self.column % 8 and self.column < self.columns:
+                    self._put(0x20)
+            elif code >= 0x20:
+                self._put(code)
+
+        self._flush()
+        self._show_cursor()
+        return len(data)
+
+    def readinto(self, buffer):
+        """The console has no input, for use with os.dupterm."""
+        return None
+
+    def _index(self, row):
+        """Return the ring buffer index of a row of the console."""
+        return (self._top + row) % self.rows
+
+    def _put(self, code):
+        """Add a character at the cursor to the pending characters."""
+        if self.column >= self.columns:
+            self._newline()
+
+        if not self.font.FIRST <= code < self.font.LAST:
+            code = 0x3F
+
+        index = self._index(self.row)
+        self._text[index][self.column] = code
+        self._attrs[index][self.column] = self._fg | self._bg << 8
+        self._pending += chr(code)
+        self.column += 1
+
+    def _flush(self):
+        """Draw the pending characters of the cursor line in one write."""
+        if self._pending:
+            column = self.column - len(self._pending)
+            self._screen.text(
+                self.font,
+                self._pending,
+                column * self.font.WIDTH,
+                self.row * self.font.HEIGHT,
+                self.palette[self._fg],
+                self.palette[self._bg],
+            )
+            self._pending = ""
+
+    def _newline(self):
+        """Move the cursor to the start of the next line, scrolling if needed."""
+        self._flush()
+        self.column = 0
+        if self.row < self.rows - 1:
+            self.row += 1
+            return
+
+        if self._view is not None:
+            # clear the top line before it scrolls around to the bottom
+            self._clear_line(0, 0, True)
+            self._top = (self._top + 1) % self.rows
+            self._view.scroll(self.font.HEIGHT)
+        else:
+            self._top = (self._top + 1) % self.rows
+            for row in range(self.rows - 1):
+                self._draw_line(row)
+
+            self._clear_line(self.row, 0, True)
+
+    def _clear_line(self, row, column, draw):
+        """Clear a row of the console from a column to the end."""
+        attr = _DEFAULT_FG | self._bg << 8
+        index = self._index(row)
+        text = self._text[index]
+        attrs = self._attrs[index]
+        for i in range(column, self.columns):
+            text[i] = 0x20
+            attrs[i] = attr
+
+        if draw:
+            self._screen.fill_rect(
+                column * self.font.WIDTH,
+                row * self.font.HEIGHT,
+                self.tft.width - column * self.font.WIDTH,
+                self.font.HEIGHT,
+                self.palette[self._bg],
+            )
+
+    def _draw_line(self, row):
+        """Draw a row of the console, one write per run of colors."""
+        index = self._index(row)
+        text = self._text[index]
+        attrs = self._attrs[index]
+        y = row * self.font.HEIGHT
+        start = 0
+        for column in range(1, self.columns + 1):
+            if column == self.columns or attrs[column] != attrs[start]:
+                self._screen.text(
+                    self.font,
+                    "".join(chr(code) for code in text[start:column]),
+                    start * self.font.WIDTH,
+                    y,
+                    self.palette[attrs[start] & 0xFF],
+                    self.palette[attrs[start] >> 8],
+                )
+                start = column
+
+    def _draw_cell(self, row, column):
+        """Draw the character at a row and column from the ring buffer."""
+        index = self._index(row)
+        attr = self._attrs[index][column]
+        self._screen.text(
+            self.font,
+            chr(self._text[index][column]),
+            column * self.font.WIDTH,
+            row * self.font.HEIGHT,
+            self.palette[attr & 0xFF],
+            self.palette[attr >> 8],
+        )
+
+    def _show_cursor(self):
+        if self.cursor and self.column < self.columns:
+            self._screen.fill_rect(
+                self.column * self.font.WIDTH,
+                self.row * self.font.HEIGHT + self.font.HEIGHT - 2,
+                self.font.WIDTH,
+                2,
+                self.palette[self._fg],
+            )
+
+    def _hide_cursor(self):
+        if self.cursor and self.column < self.columns:
+            self._draw_cell(self.row, self.column)
+
+    def _escape_code(self, code):
+        """Add a character to the escape sequence, running it when complete."""
+        if self._escape == "":
+            self._escape = "[" if code == 0x5B else None
+            return
+
+        if code < 0x40 or code > 0x7E:
+            self._escape += chr(code)
+            return
+
+        sequence = self._escape[1:]
+        self._escape = None
+        command = chr(code)
+        if sequence == "?25" and command in "hl":
+            self.cursor = command == "h"
+            return
+
+        params = [int(p) if p.isdigit() else 0 for p in sequence.split(";")]
+        count = max(1, params[0])
+        if command == "m":
+            self._sgr(params)
+        elif command == "A":
+            self.row = max(0, self.row - count)
+        elif command == "B":
+            self.row = min(self.rows - 1, self.row + count)
+        elif command == "C":
+            self.column = min(self.columns - 1, self.column + count)
+        elif command == "D":
+            self.column = max(0, self.column - count)
+        elif command in "Hf":
+            self.row = min(self.rows, count) - 1
+            column = params[1] if len(params) > 1 else 1
+            self.column = min(self.columns, max(1, column)) - 1
+        elif command == "K":
+            if params[0] == 0:
+                self._clear_line(self.row, self.column, True)
+            elif params[0] == 2:
+                self._clear_line(self.row, 0, True)
+        elif command == "J" and params[0] == 2:
+            fg, bg = self._fg, self._bg
+            self.clear()
+            self._hide_cursor()
+            self._fg, self._bg = fg, bg
+
+    def _sgr(self, params):
+        """Select the colors from the parameters of an SGR sequence."""
+        for param in params:
+            if param == 0:
+                self._fg = _DEFAULT_FG
+                self._bg = _DEFAULT_BG
+                self._bold = False
+            elif param == 1:
+                self._bold = True
+                if self._fg < 8:
+                    self._fg += 8
+            elif param == 22:
+                self._bold = False
+                if 8 <= self._fg < 16:
+                    self._fg -= 8
+            elif 30 <= param <= 37:
+                self._fg = param - 30 + (8 if self._bold else 0)
+            elif param == 39:
+                self._fg = _DEFAULT_FG
+            elif 40 <= param <= 47:
+                self._bg = param - 40
+            elif param == 49:
+                self._bg = _DEFAULT_BG
+            elif 90 <= param <= 97:
+                self._fg = param - 82
+            elif 100 <= param <= 107:
+                self._bg = param - 92
@@ -0,0 +1,317 @@
+"""
+layout.py - Text layout for the wt32sc01py driver.
+
+Lays out text inside a box on the display with word wrapping for space
+separated scripts, character wrapping for CJK scripts, left, center or right
+alignment, line spacing and ellipsis truncation of text that does not fit.
+
+Text is written with the write method for converted TrueType fonts, binary
+fonts and font chains and with the text method for rom fonts. The widths of
+words and lines are cached per font and string, and each paragraph is only
+wrapped again when its text changes, so laying out the same or slightly
+changed text on every screen refresh does not measure it again.
+
+Example:
+
+    box = layout.TextBox(tft, font, 10, 10, 300, 100, align=layout.CENTER)
+    box.draw("Hello, World!")
+
+"""
+
+from micropython import const
+from wt32sc01py import WHITE, BLACK
+
+LEFT = const(0)
+CENTER = const(1)
+RIGHT = const(2)
+
+TOP = const(0)
+MIDDLE = const(1)
+BOTTOM = const(2)
+
+_WIDTH_CACHE_SIZE = const(256)
+
+# CJK punctuation that may not start a line, it is kept with the character
+# before it when a line is wrapped.
+_NO_BREAK_BEFORE = "，。、；：？！）」』〉》】"
+
+_widths = {}
+
+
+def _is_cjk(char):
+    """Return True if the character can be wrapped on its own."""
+    code = ord(char)
+    return (
+        0x2E80 <= code <= 0x9FFF
+        or 0xAC00 <= code <= 0xD7AF
+        or 0xF900 <= code <= 0xFAFF
+        or 0xFF00 <= code <= 0xFFEF
+    )
+
+
+def _tokens(paragraph):
+    """
+    Split a paragraph into the words, spaces and CJK characters that lines
+    can be wrapped between.
+    """
+    tokens = []
+    word = ""
+    for char in paragraph:
+        if char == " " or _is_cjk(char):
+            if word:
+                tokens.append(word)
+                word = ""
+            tokens.append(char)
+        else:
+            word += char
+
+    if word:
+        tokens.append(word)
+
+    return tokens
+
+
+def text_width(tft, font, string):
+    """
+    Return the width in pixels of a string written in the font. Widths are
+    cached per font and string.
+
+    Args:
+        tft (WT32SC01): display driver
+        font (font): rom font module, converted TrueType font module,
+            BinaryFont or FontChain
+        string (str): string to measure
+    """
+    key = (font, string)
+    width = _widths.get(key)
+    if width is not None:
+        return width
+
+    if hasattr(font, "FIRST"):
+        width = 0
+        for char in string:
+            if font.FIRST <= ord(char) < font.LAST:
+                width += font.WIDTH
+    else:
+        width = tft.write_width(font, string)
+
+    if len(_widths) >= _WIDTH_CACHE_SIZE:
+        _widths.clear()
+
+    _widths[key] = width
+    return width
+
+
+class TextBox:
+    """
+    A box on the display that text is laid out and drawn in. Lines that did
+    not change since the last draw are not drawn again.
+
+    Args:
+        tft (WT32SC01): display driver
+        font (font): rom font module, converted TrueType font module,
+            BinaryFont or FontChain
+        x (int): column of the box
+        y (int): row of the box
+        width (int): width of the box
+        height (int): height of the box
+        fg (int): 565 encoded text color, defaults to WHITE
+        bg (int): 565 encoded background color, defaults to BLACK, None to
+            draw only the text without clearing the box
+        align (int): LEFT, CENTER or RIGHT, defaults to LEFT
+        valign (int): TOP, MIDDLE or BOTTOM, defaults to TOP
+        line_spacing (int): rows between lines, defaults to 0
+        ellipsis (str): appended to the last line when the text does not fit
+            in the box, defaults to "...", None to cut the text
+    """
+
+    def __init__(
+        self,
+        tft,
+        font,
+        x,
+        y,
+        width,
+        height,
+        fg=WHITE,
+        bg=BLACK,
+        align=LEFT,
+        valign=TOP,
+        line_spacing=0,
+        ellipsis="...",
+    ):
+        self.tft = tft
+        self.font = font
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.fg = fg
+        self.bg = bg
+        self.align = align
+        self.valign = valign
+        self.line_height = font.HEIGHT + line_spacing
+        self.max_lines = max(1, (height + line_spacing) // self.line_height)
+        self.ellipsis = ellipsis
+        self.lines = []
+        self._paragraphs = {}
+        self._drawn = []
+        self._colors = (fg, bg)
+        self._write = tft.text if hasattr(font, "FIRST") else tft.write
+
+    def _width(self, string):
+        return text_width(self.tft, self.font, string)
+
+    def _wrap(self, paragraph):
+        """Return the lines of a paragraph wrapped to the width of the box."""
+        lines = []
+        line = ""
+        line_width = 0
+        for token in _tokens(paragraph):
+            token_width = self._width(token)
+            if token == " ":
+                if line:
+                    line += token
+                    line_width += token_width
+                continue
+
+            if line and line_width + token_width > self.width:
+                if token in _NO_BREAK_BEFORE and len(line) > 1 and _is_cjk(line[-1]):
+                    lines.append(line[:-1])
+                    line = line[-1]
+                else:
+                    lines.append(line.rstrip())
+                    line = ""
+
+                line_width = self._width(line)
+
+            if token_width > self.width:
+                for char in token:
+                    char_width = self._width(char)
+                    if line and line_width + char_width > self.width:
+                        lines.append(line.rstrip())
+                        line = ""
+                        line_width = 0
+
+                    line += char
+                    line_width += char_width
+            else:
+                line += token
+                line_width += token_width
+
+        lines.append(line.rstrip())
+        return lines
+
+    def _truncate(self, line):
+        """Shorten a line until it fits in the box with the ellipsis."""
+        ellipsis = self.ellipsis or ""
+        width = self._width(line) + self._width(ellipsis)
+        while line and width > self.width:
+            width -= self._width(line[-1])
+            line = line[:-1]
+
+        return line.rstrip() + ellipsis
+
+    def layout(self, text):
+        """
+        Wrap the text into the lines of the box, only wrapping the paragraphs
+        that changed since the last layout. Lines are separated by "\\n".
+
+        Args:
+            text (str): text to lay out
+
+        Returns:
+            list: lines of text that fit in the box
+        """
+        paragraphs = {}
+        lines = []
+        for paragraph in text.split("\n"):
+            wrapped = paragraphs.get(paragraph)
+            if wrapped is None:
+                wrapped = self._paragraphs.get(paragraph)
+                if wrapped is None:
+                    wrapped = self._wrap(paragraph)
+                paragraphs[paragraph] = wrapped
+
+            lines.extend(wrapped)
+
+        self._paragraphs = paragraphs
+        if len(lines) > self.max_lines:
+            lines = lines[: self.max_lines]
+            lines[-1] = self._truncate(lines[-1])
+
+        self.lines = lines
+        return lines
+
+    def draw(self, text=None):
+        """
+        Draw the lines of the box, laying out the text first if given. Only
+        lines that changed since the last draw are drawn and rows that are no
+        longer used are cleared.
+
+        Args:
+            text (str): text to lay out, None to draw the current lines
+        """
+        if text is not None:
+            self.layout(text)
+
+        if self._colors != (self.fg, self.bg):
+            self._colors = (self.fg, self.bg)
+            self._drawn = []
+
+        top = self.y
+        if self.valign != TOP:
+            unused = self.height - len(self.lines) * self.line_height
+            top += unused // 2 if self.valign == MIDDLE else unused
+
+        drawn = []
+        for row, line in enumerate(self.lines):
+            x = self.x
+            if self.align != LEFT:
+                unused = self.width - self._width(line)
+                x += unused // 2 if self.align == CENTER else unused
+
+            drawn.append((line, x, top + row * self.line_height))
+
+        self.tft.push_clip(self.x, self.y, self.width, self.height)
+        if self.bg is not None:
+            rows = [entry[2] for entry in drawn]
+            for entry in self._drawn:
+                if entry[2] not in rows:
+                    self.tft.fill_rect(
+                        self.x, entry[2], self.width, self.line_height, self.bg
+                    )
+
+        for row, entry in enumerate(drawn):
+            if row >= len(self._drawn) or self._drawn[row] != entry:
+                self._draw_line(*entry)
+
+        self.tft.pop_clip()
+        self._drawn = drawn
+
+    def _draw_line(self, line, x, y):
+        """Draw a line and clear the rest of its row."""
+        if self.bg is not None:
+            width = self._width(line)
+            tft = self.tft
+            tft.fill_rect(self.x, y, x - self.x, self.line_height, self.bg)
+            right = x + width
+            tft.fill_rect(
+                right, y, self.x + self.width - right, self.line_height, self.bg
+            )
+            tft.fill_rect(
+                x,
+                y + self.font.HEIGHT,
+                width,
+                self.line_height - self.font.HEIGHT,
+                self.bg,
+            )
+
+        self._write(self.font, line, x, y, self.fg, self.bg)
+
+    def clear(self):
+        """Clear the box to the background color and forget the drawn lines."""
+        if self.bg is not None:
+            self.tft.fill_rect(self.x, self.y, self.width, self.height, self.bg)
+
+        self._drawn = []
@@ -0,0 +1,104 @@
+"""
+stripchart.py - A hardware scrolled strip chart for the wt32sc01py driver.
+
+The chart plots one or more series of samples. Each sample scrolls the chart
+with a Viewport and draws one new column, a span from the previous to the
+current value of each series, so the cost of a sample does not depend on how
+much history is on the display.
+
+The chart scrolls from right to left in the landscape rotations and from the
+bottom to the top in the portrait rotations, with the values along the other
+axis. Fixed areas at the start and end of the scrolling axis are not scrolled
+and can be drawn with the driver, for example to label the current values.
+
+Example:
+
+    chart = StripChart(tft, (RED, GREEN), -1, 1, bfa=80)
+    while True:
+        chart.add(math.sin(angle), math.cos(angle))
+        angle += 0.1
+
+"""
+
+from wt32sc01py import BLACK
+from viewport import Viewport
+
+
+class StripChart:
+    """
+    A strip chart of one or more series in the scrolling area of the display.
+
+    Args:
+        tft (WT32SC01): display driver
+        colors (tuple): 565 encoded color of each series
+        minimum (int): value plotted at the bottom or left of the chart,
+            defaults to 0
+        maximum (int): value plotted at the top or right of the chart,
+            defaults to 100
+        bg (int): 565 encoded background color, defaults to BLACK
+        tfa (int): size of the fixed area at the top or left, defaults to 0
+        bfa (int): size of the fixed area at the bottom or right, defaults
+            to 0
+        step (int): pixels to scroll per sample, defaults to 1
+    """
+
+    def __init__(
+        self, tft, colors, minimum=0, maximum=100, bg=BLACK, tfa=0, bfa=0, step=1
+    ):
+        self.tft = tft
+        self.view = Viewport(tft, tfa, bfa)
+        self.colors = colors
+        self.minimum = minimum
+        self.maximum = maximum
+        self.bg = bg
+        self.step = step
+        self.size = tft.height if self.view.axis else tft.width
+        self.clear()
+
+    def clear(self):
+        """Clear the chart and start the series again."""
+        self._last = [None] * len(self.colors)
+        self.view.scroll_to(0)
+        self.view.fill_rect(0, 0, self.tft.width, self.tft.height, self.bg)
+
+    def _position(self, value):
+        """Return the position of a value across the chart."""
+        value = min(max(value, self.minimum), self.maximum)
+        position = int(
+            (value - self.minimum) * (self.size - 1) / (self.maximum - self.minimum)
+        )
+        return self.size - 1 - position if self.view.axis else position
+
+    def _span(self, along, start, length, color):
+        """Fill a span across the newest column of the chart."""
+        if self.view.axis:
+            self.view.fill_rect(along, start, self.step, length, color)
+        else:
+            self.view.fill_rect(start, along, length, self.step, color)
+
+    def add(self, *values):
+        """
+        Scroll the chart and plot the next sample of each series.
+
+        Args:
+            values (int or float): one value per series, None to leave a gap
+                in the series
+        """
+        view = self.view
+        view.scroll(self.step)
+        along = view.tfa + view.length - self.step
+        self._span(along, 0, self.size, self.bg)
+
+        last = self._last
+        for index, value in enumerate(values):
+            if value is None:
+                last[index] = None
+                continue
+
+            current = self._position(value)
+            previous = current if last[index] is None else last[index]
+            start = min(previous, current)
+            self._span(
+                along, start, max(previous, current) - start + 1, self.colors[index]
+            )
+            last[index] = current
@@ -0,0 +1,271 @@
+"""
+viewport.py - Hardware scrolled drawing for the wt32sc01py driver.
+
+A Viewport owns the vertical scrolling definition and scroll position of the
+display. Drawing through the viewport uses the coordinates of the display as
+it is seen, the viewport maps them to the frame memory and splits anything
+crossing the end of the scrolling area into two clipped writes. Drawing is
+clipped to the scrolling area, the fixed areas are drawn with the driver.
+Scrolling content only needs the newly exposed rows or columns to be drawn.
+
+The hardware scrolls along the y axis in the portrait rotations and along the
+x axis in the landscape rotations.
+
+Example:
+
+    view = Viewport(tft)
+    while True:
+        view.scroll(1)
+        view.fill_rect(0, tft.height - 1, tft.width, 1, BLACK)
+
+"""
+
+from wt32sc01py import WHITE, BLACK
+
+
+class Viewport:
+    """
+    A hardware scrolled area of the display between fixed areas at the start
+    and end of the scrolling axis.
+
+    Args:
+        tft (WT32SC01): display driver
+        tfa (int): size of the fixed area at the top or left, defaults to 0
+        bfa (int): size of the fixed area at the bottom or right, defaults
+            to 0
+    """
+
+    def __init__(self, tft, tfa=0, bfa=0):
+        self.tft = tft
+        self.axis, self._direction = tft.scroll_axis()
+        self.tfa = tfa
+        self.bfa = bfa
+        size = tft.width if self.axis else tft.height
+        self.length = size - tfa - bfa
+        self.offset = 0
+
+        if self._direction > 0:
+            tft.vscrdef(tfa, self.length, bfa)
+        else:
+            tft.vscrdef(bfa, self.length, tfa)
+
+        self.scroll_to(0)
+
+    def scroll(self, amount):
+        """
+        Scroll the contents of the viewport toward the start of the axis.
+
+        Args:
+            amount (int): pixels to scroll, negative to scroll back
+        """
+        self.scroll_to(self.offset + amount)
+
+    def scroll_to(self, offset):
+        """
+        Set the scroll position of the viewport.
+
+        Args:
+            offset (int): pixels the contents are scrolled from the start
+        """
+        self.offset = offset % self.length
+        if self._direction > 0:
+            self.tft.vscsad(self.tfa + self.offset)
+        else:
+            self.tft.vscsad(self.bfa + (-self.offset) % self.length)
+
+    def map(self, position):
+        """
+        Return the frame memory coordinate of a position along the scrolling
+        axis. Positions in the fixed areas are not changed.
+
+        Args:
+            position (int): x or y coordinate as seen on the display
+        """
+        start = position - self.tfa
+        if 0 <= start < self.length:
+            return self.tfa + (start + self.offset) % self.length
+
+        return position
+
+    def _split(self, start, extent, draw):
+        """
+        Call draw with the position to draw a primitive at for each part of it
+        inside the scrolling area, clipped to that part.
+
+        Args:
+            start (int): start of the primitive along the scrolling axis
+            extent (int): size of the primitive along the scrolling axis
+            draw (function): draws the primitive at a given position
+        """
+        end = self.tfa + self.length
+        visible = max(start, self.tfa)
+        last = min(start + extent, end)
+        if visible >= last:
+            return
+
+        shift = self.map(visible) - visible
+        first = visible + shift
+        stop = last + shift
+        self._clipped(first, min(stop, end), start + shift, draw)
+        if stop > end:
+            self._clipped(
+                self.tfa, stop - self.length, start + shift - self.length, draw
+            )
+
+    def _clipped(self, low, high, position, draw):
+        """Call draw at a position with drawing clipped from low to high."""
+        tft = self.tft
+        if self.axis:
+            tft.push_clip(low, 0, high - low, tft.height)
+        else:
+            tft.push_clip(0, low, tft.width, high - low)
+
+        draw(position)
+        tft.pop_clip()
+
+    def pixel(self, x, y, color):
+        """
+        Draw a pixel at the given location and color.
+
+        Args:
+            x (int): x coordinate
+            Y (int): y coordinate
+            color (int): 565 encoded color
+        """
+        if self.axis:
+            if self.tfa <= x < self.tfa + self.length:
+                self.tft.pixel(self.map(x), y, color)
+        elif self.tfa <= y < self.tfa + self.length:
+            self.tft.pixel(x, self.map(y), color)
+
+    def hline(self, x, y, length, color):
+        """
+        Draw horizontal line at the given location and color.
+
+        Args:
+            x (int): x coordinate
+            Y (int): y coordinate
+            length (int): length of line
+            color (int): 565 encoded color
+        """
+        self.fill_rect(x, y, length, 1, color)
+
+    def vline(self, x, y, length, color):
+        """
+        Draw vertical line at the given location and color.
+
+        Args:
+            x (int): x coordinate
+            Y (int): y coordinate
+            length (int): length of line
+            color (int): 565 encoded color
+        """
+        self.fill_rect(x, y, 1, length, color)
+
+    def fill_rect(self, x, y, width, height, color):
+        """
+        Draw a rectangle at the given location, size and filled with color.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            width (int): Width in pixels
+            height (int): Height in pixels
+            color (int): 565 encoded color
+        """
+        tft = self.tft
+        if self.axis:
+            self._split(x, width, lambda p: tft.fill_rect(p, y, width, height, color))
+        else:
+            self._split(y, height, lambda p: tft.fill_rect(x, p, width, height, color))
+
+    def blit_buffer(self, buffer, x, y, width, height):
+        """
+        Copy buffer to display at the given location.
+
+        Args:
+            buffer (bytes): Data to copy to display
+            x (int): Top left corner x coordinate
+            Y (int): Top left corner y coordinate
+            width (int): Width
+            height (int): Height
+        """
+        tft = self.tft
+        if self.axis:
+            self._split(
+                x, width, lambda p: tft.blit_buffer(buffer, p, y, width, height)
+            )
+        else:
+            self._split(
+                y, height, lambda p: tft.blit_buffer(buffer, x, p, width, height)
+            )
+
+    def bitmap(self, bitmap, x, y, index=0):
+        """
+        Draw a converted bitmap at the given location.
+
+        Args:
+            bitmap (bitmap_module): The module containing the bitmap to draw
+            x (int): column to start drawing at
+            y (int): row to start drawing at
+            index (int): Optional index of bitmap to draw from multiple bitmap
+                module
+        """
+        tft = self.tft
+        if self.axis:
+            self._split(x, bitmap.WIDTH, lambda p: tft.bitmap(bitmap, p, y, index))
+        else:
+            self._split(y, bitmap.HEIGHT, lambda p: tft.bitmap(bitmap, x, p, index))
+
+    def text(self, font, text, x, y, color=WHITE, background=BLACK, scale=1):
+        """
+        Draw text in a rom font, see the text method of the driver.
+
+        Args:
+            font (module): font module or BinaryFont to use.
+            text (str): text to write
+            x (int): column to start drawing at
+            y (int): row to start drawing at
+            color (int): 565 encoded color to use for characters
+            background (int): 565 encoded color to use for background or None
+                to only draw the foreground pixels of the characters
+            scale (int): integer scale of the characters, defaults to 1
+        """
+        tft = self.tft
+        if self.axis:
+            self._split(
+                x,
+                len(text) * font.WIDTH * scale,
+                lambda p: tft.text(font, text, p, y, color, background, scale),
+            )
+        else:
+            self._split(
+                y,
+                font.HEIGHT * scale,
+                lambda p: tft.text(font, text, x, p, color, background, scale),
+            )
+
+    def write(self, font, string, x, y, fg=WHITE, bg=BLACK):
+        """
+        Write a string in a converted true-type font, see the write method of
+        the driver.
+
+        Args:
+            font (font): The module, BinaryFont or FontChain containing the
+                converted true-type font
+            string (string): The string to write
+            x (int): column to start writing
+            y (int): row to start writing
+            fg (int): foreground color, optional, defaults to WHITE
+            bg (int): background color, optional, defaults to BLACK, None to
+                only draw the foreground pixels of the characters
+        """
+        tft = self.tft
+        if self.axis:
+            self._split(
+                x,
+                len(string) * font.MAX_WIDTH,
+                lambda p: tft.write(font, string, p, y, fg, bg),
+            )
+        else:
+            self._split(y, font.HEIGHT, lambda p: tft.write(font, string, x, p, fg, bg))
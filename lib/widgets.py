@@ -0,0 +1,734 @@
+"""
+widgets.py - Retained mode widgets for the wt32sc01py driver.
+
+Widgets keep the state they were last drawn with. Changing a property of a
+widget only marks the part of it that has to be drawn again as damaged, and
+Screen.refresh draws the damaged part of each widget in one pass, clipped to
+the damage, so a dashboard updated many times a second only repaints what
+changed.
+
+Text is written with the write method for converted TrueType fonts, binary
+fonts and font chains and with the text method for rom fonts.
+
+Example:
+
+    screen = Screen(tft)
+    speed = screen.add(Readout(font, 10, 10, 120, fmt="{:.1f} km/h"))
+    fuel = screen.add(Bar(10, 60, 200, 20, RED))
+    while True:
+        speed.set_value(read_speed())
+        fuel.set_value(read_fuel())
+        screen.refresh()
+
+"""
+
+import math
+from wt32sc01py import WHITE, BLACK
+from layout import text_width, LEFT, CENTER, RIGHT
+
+
+def _union(rect, other):
+    """Return the rectangle covering two (x0, y0, x1, y1) rectangles."""
+    if rect is None:
+        return other
+
+    return (
+        min(rect[0], other[0]),
+        min(rect[1], other[1]),
+        max(rect[2], other[2]),
+        max(rect[3], other[3]),
+    )
+
+
+def _intersect(rect, other):
+    """Return the overlap of two (x0, y0, x1, y1) rectangles or None."""
+    x0 = max(rect[0], other[0])
+    y0 = max(rect[1], other[1])
+    x1 = min(rect[2], other[2])
+    y1 = min(rect[3], other[3])
+    if x0 < x1 and y0 < y1:
+        return (x0, y0, x1, y1)
+
+    return None
+
+
+def _draw_text(tft, font, text, x, y, fg, bg):
+    """Draw text with the method of the driver for the font."""
+    if hasattr(font, "FIRST"):
+        tft.text(font, text, x, y, fg, bg)
+    else:
+        tft.write(font, text, x, y, fg, bg)
+
+
+class Widget:
+    """
+    Base class of the widgets, a rectangle of the display that draws itself.
+
+    Args:
+        x (int): column of the widget
+        y (int): row of the widget
+        width (int): width of the widget
+        height (int): height of the widget
+        fg (int): 565 encoded foreground color, defaults to WHITE
+        bg (int): 565 encoded background color, defaults to BLACK
+    """
+
+    def __init__(self, x, y, width, height, fg=WHITE, bg=BLACK):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.fg = fg
+        self.bg = bg
+        self._damage = None
+        self.invalidate()
+
+    def box(self):
+        """Return the rectangle of the widget as (x0, y0, x1, y1)."""
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def contains(self, x, y):
+        """Return True if the point is inside the widget."""
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    def invalidate(self, x=None, y=None, width=None, height=None):
+        """
+        Mark a rectangle of the widget to be drawn on the next refresh, the
+        whole widget if no rectangle is given.
+
+        Args:
+            x (int): column of the rectangle
+            y (int): row of the rectangle
+            width (int): width of the rectangle
+            height (int): height of the rectangle
+        """
+        if x is None:
+            rect = self.box()
+        else:
+            rect = (x, y, x + width, y + height)
+
+        self._damage = _union(self._damage, rect)
+
+    def set_colors(self, fg, bg):
+        """
+        Set the colors of the widget.
+
+        Args:
+            fg (int): 565 encoded foreground color
+            bg (int): 565 encoded background color
+        """
+        if fg != self.fg or bg != self.bg:
+            self.fg = fg
+            self.bg = bg
+            self.invalidate()
+
+    def damage(self, tft):
+        """
+        Return the rectangle of the widget that has to be drawn as
+        (x0, y0, x1, y1) or None if the widget did not change.
+
+        Args:
+            tft (WT32SC01): display driver
+        """
+        return self._damage
+
+    def paint(self, tft, damage):
+        """
+        Draw the damaged rectangle of the widget.
+
+        Args:
+            tft (WT32SC01): display driver
+            damage (tuple): rectangle to draw as (x0, y0, x1, y1)
+        """
+        tft.push_clip(
+            damage[0], damage[1], damage[2] - damage[0], damage[3] - damage[1]
+        )
+        self.draw(tft)
+        tft.pop_clip()
+        self._damage = None
+
+    def draw(self, tft):
+        """
+        Draw the widget, the drawing is clipped to the damaged rectangle.
+
+        Args:
+            tft (WT32SC01): display driver
+        """
+        tft.fill_rect(self.x, self.y, self.width, self.height, self.bg)
+
+
+class Label(Widget):
+    """
+    A line of text. The label remembers the column and width of each glyph
+    it drew, changing the text only draws the glyphs that changed and clears
+    the columns the new text no longer covers.
+
+    Args:
+        font (font): rom font module, converted TrueType font module,
+            BinaryFont or FontChain
+        x (int): column of the label
+        y (int): row of the label
+        width (int): width of the label
+        text (str): text of the label, defaults to ""
+        fg (int): 565 encoded text color, defaults to WHITE
+        bg (int): 565 encoded background color, defaults to BLACK
+        align (int): LEFT, CENTER or RIGHT, defaults to LEFT
+    """
+
+    def __init__(self, font, x, y, width, text="", fg=WHITE, bg=BLACK, align=LEFT):
+        self.font = font
+        self.text = text
+        self.align = align
+        self._cells = None
+        self._drawn = None
+        self._next = None
+        self._runs = None
+        self._freed = None
+        self._changed = True
+        super().__init__(x, y, width, font.HEIGHT, fg, bg)
+
+    def set_text(self, text):
+        """
+        Set the text of the label.
+
+        Args:
+            text (str): text of the label
+        """
+        if text != self.text:
+            self.text = text
+            self._changed = True
+
+    def _layout(self, tft):
+        """
+        Return the (character, column, width) cell of each glyph of the text
+        and the column and width of the text.
+        """
+        font = self.font
+        positions = []
+        if hasattr(font, "FIRST"):
+            width = 0
+            for char in self.text:
+                positions.append(width)
+                if font.FIRST <= ord(char) < font.LAST:
+                    positions.append(font.WIDTH)
+                    width += font.WIDTH
+                else:
+                    positions.append(0)
+        else:
+            width = tft.write_width(font, self.text, positions)
+
+        x = self.x
+        if self.align == CENTER:
+            x += (self.width - width) // 2
+        elif self.align == RIGHT:
+            x += self.width - width
+
+        cells = [
+            (char, x + positions[i * 2], positions[i * 2 + 1])
+            for i, char in enumerate(self.text)
+        ]
+        return cells, x, width
+
+    def damage(self, tft):
+        damage = self._damage
+        if not self._changed:
+            return damage
+
+        self._next = self._layout(tft)
+        cells, x, width = self._next
+        if damage is not None or self._cells is None:
+            self._runs = None
+            if self._drawn is not None:
+                left, right = self._drawn
+                damage = _union(damage, (left, self.y, right, self.y + self.height))
+
+            return _union(damage, (x, self.y, x + width, self.y + self.height))
+
+        # glyphs that changed or are overlapped by a changed glyph on their
+        # left are drawn again in runs of consecutive glyphs
+        previous = self._cells
+        runs = []
+        changed = False
+        for i, cell in enumerate(cells):
+            changed = (
+                i >= len(previous)
+                or cell != previous[i]
+                or (changed and cells[i - 1][1] + cells[i - 1][2] > cell[1])
+            )
+            if changed:
+                if runs and runs[-1][1] == i:
+                    runs[-1][1] = i + 1
+                else:
+                    runs.append([i, i + 1])
+
+                damage = _union(
+                    damage, (cell[1], self.y, cell[1] + cell[2], self.y + self.height)
+                )
+
+        # columns of the old text outside the new text are cleared
+        left, right = self._drawn
+        freed = []
+        if left < x:
+            freed.append((left, min(x, right)))
+        if x + width < right:
+            freed.append((max(x + width, left), right))
+
+        for low, high in freed:
+            damage = _union(damage, (low, self.y, high, self.y + self.height))
+
+        if damage is None:
+            self._cells = cells
+            self._drawn = (x, x + width)
+            self._changed = False
+        else:
+            self._runs = runs
+            self._freed = freed
+
+        return damage
+
+    def draw(self, tft):
+        if self._next is None:
+            self._next = self._layout(tft)
+
+        cells, x, width = self._next
+        if self._runs is not None and self._damage is None:
+            for start, end in self._runs:
+                _draw_text(
+                    tft,
+                    self.font,
+                    self.text[start:end],
+                    cells[start][1],
+                    self.y,
+                    self.fg,
+                    self.bg,
+                )
+
+            for low, high in self._freed:
+                tft.fill_rect(low, self.y, high - low, self.height, self.bg)
+        else:
+            tft.fill_rect(self.x, self.y, x - self.x, self.height, self.bg)
+            right = x + width
+            tft.fill_rect(
+                right, self.y, self.x + self.width - right, self.height, self.bg
+            )
+            _draw_text(tft, self.font, self.text, x, self.y, self.fg, self.bg)
+
+        self._cells = cells
+        self._drawn = (x, x + width)
+        self._next = None
+        self._runs = None
+        self._freed = None
+        self._changed = False
+
+
+class Readout(Label):
+    """
+    A number formatted with a format string, right aligned by default.
+
+    Args:
+        font (font): rom font module, converted TrueType font module,
+            BinaryFont or FontChain
+        x (int): column of the readout
+        y (int): row of the readout
+        width (int): width of the readout
+        value (int or float): value to show, defaults to 0
+        fmt (str): format string for the value, defaults to "{}"
+        fg (int): 565 encoded text color, defaults to WHITE
+        bg (int): 565 encoded background color, defaults to BLACK
+        align (int): LEFT, CENTER or RIGHT, defaults to RIGHT
+    """
+
+    def __init__(
+        self, font, x, y, width, value=0, fmt="{}", fg=WHITE, bg=BLACK, align=RIGHT
+    ):
+        self.fmt = fmt
+        self.value = value
+        super().__init__(font, x, y, width, fmt.format(value), fg, bg, align)
+
+    def set_value(self, value):
+        """
+        Set the value of the readout.
+
+        Args:
+            value (int or float): value to show
+        """
+        self.value = value
+        self.set_text(self.fmt.format(value))
+
+
+class Bar(Widget):
+    """
+    A horizontal or vertical bar filled in proportion to a value. Changing
+    the value damages only the part of the bar between the old and new ends.
+
+    Args:
+        x (int): column of the bar
+        y (int): row of the bar
+        width (int): width of the bar
+        height (int): height of the bar
+        fg (int): 565 encoded color of the filled part, defaults to WHITE
+        bg (int): 565 encoded color of the empty part, defaults to BLACK
+        minimum (int): value of an empty bar, defaults to 0
+        maximum (int): value of a full bar, defaults to 100
+        value (int or float): value of the bar, defaults to minimum
+        vertical (bool): fill from the bottom up instead of from the left,
+            defaults to False
+    """
+
+    def __init__(
+        self,
+        x,
+        y,
+        width,
+        height,
+        fg=WHITE,
+        bg=BLACK,
+        minimum=0,
+        maximum=100,
+        value=None,
+        vertical=False,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.vertical = vertical
+        super().__init__(x, y, width, height, fg, bg)
+        self.value = minimum if value is None else value
+        self._filled = self._length(self.value)
+
+    def _length(self, value):
+        """Return the filled length of the bar for a value."""
+        value = min(max(value, self.minimum), self.maximum)
+        size = self.height if self.vertical else self.width
+        return int((value - self.minimum) * size / (self.maximum - self.minimum))
+
+    def set_value(self, value):
+        """
+        Set the value of the bar.
+
+        Args:
+            value (int or float): value of the bar
+        """
+        self.value = value
+        filled = self._length(value)
+        if filled != self._filled:
+            low = min(filled, self._filled)
+            high = max(filled, self._filled)
+            if self.vertical:
+                self.invalidate(
+                    self.x, self.y + self.height - high, self.width, high - low
+                )
+            else:
+                self.invalidate(self.x + low, self.y, high - low, self.height)
+
+            self._filled = filled
+
+    def draw(self, tft):
+        filled = self._filled
+        if self.vertical:
+            empty = self.height - filled
+            tft.fill_rect(self.x, self.y, self.width, empty, self.bg)
+            tft.fill_rect(self.x, self.y + empty, self.width, filled, self.fg)
+        else:
+            tft.fill_rect(self.x, self.y, filled, self.height, self.fg)
+            tft.fill_rect(
+                self.x + filled, self.y, self.width - filled, self.height, self.bg
+            )
+
+
+class Gauge(Widget):
+    """
+    A half circle dial with tick marks and a needle pointing at a value.
+    Changing the value damages only the rectangle around the old and new
+    needle.
+
+    Args:
+        x (int): column of the gauge
+        y (int): row of the gauge
+        width (int): width of the gauge, the dial is centered at the bottom
+        height (int): height of the gauge
+        fg (int): 565 encoded color of the needle, defaults to WHITE
+        bg (int): 565 encoded background color, defaults to BLACK
+        minimum (int): value at the left of the dial, defaults to 0
+        maximum (int): value at the right of the dial, defaults to 100
+        value (int or float): value of the gauge, defaults to minimum
+        ticks (int): number of tick marks, defaults to 11
+        tick_color (int): 565 encoded color of the tick marks, defaults to fg
+    """
+
+    def __init__(
+        self,
+        x,
+        y,
+        width,
+        height,
+        fg=WHITE,
+        bg=BLACK,
+        minimum=0,
+        maximum=100,
+        value=None,
+        ticks=11,
+        tick_color=None,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tick_color = fg if tick_color is None else tick_color
+        super().__init__(x, y, width, height, fg, bg)
+        self._cx = x + width // 2
+        self._cy = y + height - 1
+        self._radius = min(width // 2, height) - 1
+        self._ticks = []
+        for tick in range(ticks):
+            outer = self._point(tick / max(1, ticks - 1), self._radius)
+            inner = self._point(tick / max(1, ticks - 1), self._radius * 4 // 5)
+            self._ticks.append(inner + outer)
+
+        self.value = minimum if value is None else value
+        self._needle = self._needle_for(self.value)
+
+    def _point(self, fraction, length):
+        """Return the point at a length from the center along the dial."""
+        angle = math.pi * (1 - fraction)
+        return (
+            self._cx + int(round(length * math.cos(angle))),
+            self._cy - int(round(length * math.sin(angle))),
+        )
+
+    def _needle_for(self, value):
+        """Return the end point of the needle for a value."""
+        value = min(max(value, self.minimum), self.maximum)
+        fraction = (value - self.minimum) / (self.maximum - self.minimum)
+        return self._point(fraction, self._radius * 3 // 4)
+
+    def _needle_box(self, needle):
+        """Invalidate the rectangle around the needle."""
+        x0 = min(self._cx, needle[0])
+        y0 = min(self._cy, needle[1])
+        self.invalidate(
+            x0,
+            y0,
+            max(self._cx, needle[0]) - x0 + 1,
+            max(self._cy, needle[1]) - y0 + 1,
+        )
+
+    def set_value(self, value):
+        """
+        Set the value of the gauge.
+
+        Args:
+            value (int or float): value of the gauge
+        """
+        self.value = value
+        needle = self._needle_for(value)
+        if needle != self._needle:
+            self._needle_box(self._needle)
+            self._needle_box(needle)
+            self._needle = needle
+
+    def draw(self, tft):
+        tft.fill_rect(self.x, self.y, self.width, self.height, self.bg)
+        for x0, y0, x1, y1 in self._ticks:
+            tft.line(x0, y0, x1, y1, self.tick_color)
+
+        tft.line(self._cx, self._cy, self._needle[0], self._needle[1], self.fg)
+
+
+class Button(Widget):
+    """
+    A framed button with centered text, drawn with the colors swapped while
+    it is pressed. Use contains or Screen.widget_at to hit test touches.
+
+    Args:
+        font (font): rom font module, converted TrueType font module,
+            BinaryFont or FontChain
+        x (int): column of the button
+        y (int): row of the button
+        width (int): width of the button
+        height (int): height of the button
+        text (str): text of the button
+        fg (int): 565 encoded text and frame color, defaults to WHITE
+        bg (int): 565 encoded background color, defaults to BLACK
+        radius (int): radius of the corners of the frame, defaults to 0
+    """
+
+    def __init__(self, font, x, y, width, height, text, fg=WHITE, bg=BLACK, radius=0):
+        self.font = font
+        self.text = text
+        self.radius = radius
+        self.pressed = False
+        super().__init__(x, y, width, height, fg, bg)
+
+    def set_text(self, text):
+        """
+        Set the text of the button.
+
+        Args:
+            text (str): text of the button
+        """
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+
+    def set_pressed(self, pressed):
+        """
+        Set the pressed state of the button.
+
+        Args:
+            pressed (bool): True while the button is pressed
+        """
+        if pressed != self.pressed:
+            self.pressed = pressed
+            self.invalidate()
+
+    def draw(self, tft):
+        fg, bg = (self.bg, self.fg) if self.pressed else (self.fg, self.bg)
+        if self.radius:
+            tft.fill_round_rect(
+                self.x, self.y, self.width, self.height, self.radius, bg
+            )
+            tft.round_rect(self.x, self.y, self.width, self.height, self.radius, fg)
+        else:
+            tft.fill_rect(self.x + 1, self.y + 1, self.width - 2, self.height - 2, bg)
+            tft.rect(self.x, self.y, self.width, self.height, fg)
+        width = text_width(tft, self.font, self.text)
+        _draw_text(
+            tft,
+            self.font,
+            self.text,
+            self.x + (self.width - width) // 2,
+            self.y + (self.height - self.font.HEIGHT) // 2,
+            fg,
+            bg,
+        )
+
+
+class Icon(Widget):
+    """
+    A converted bitmap, changing the index draws another bitmap of a
+    multiple bitmap module.
+
+    Args:
+        bitmap (bitmap_module): The module containing the bitmap to draw
+        x (int): column of the icon
+        y (int): row of the icon
+        index (int): index of the bitmap to draw, defaults to 0
+    """
+
+    def __init__(self, bitmap, x, y, index=0):
+        self.bitmap = bitmap
+        self.index = index
+        super().__init__(x, y, bitmap.WIDTH, bitmap.HEIGHT)
+
+    def set_index(self, index):
+        """
+        Set the index of the bitmap to draw.
+
+        Args:
+            index (int): index of the bitmap
+        """
+        if index != self.index:
+            self.index = index
+            self.invalidate()
+
+    def draw(self, tft):
+        tft.bitmap(self.bitmap, self.x, self.y, self.index)
+
+
+class Screen:
+    """
+    The widgets of the display, drawn in the order they were added.
+
+    Args:
+        tft (WT32SC01): display driver
+        bg (int): 565 encoded color of the screen behind the widgets,
+            defaults to BLACK
+    """
+
+    def __init__(self, tft, bg=BLACK):
+        self.tft = tft
+        self.bg = bg
+        self.widgets = []
+        self._cleared = []
+
+    def add(self, widget):
+        """
+        Add a widget to the screen, it is drawn on the next refresh.
+
+        Args:
+            widget (Widget): widget to add
+
+        Returns:
+            Widget: the widget added
+        """
+        self.widgets.append(widget)
+        widget.invalidate()
+        return widget
+
+    def remove(self, widget):
+        """
+        Remove a widget from the screen, its rectangle is cleared on the next
+        refresh.
+
+        Args:
+            widget (Widget): widget to remove
+        """
+        self.widgets.remove(widget)
+        self._cleared.append(widget.box())
+
+    def invalidate(self):
+        """Draw the whole screen on the next refresh."""
+        self._cleared = [(0, 0, self.tft.width, self.tft.height)]
+        for widget in self.widgets:
+            widget.invalidate()
+
+    def widget_at(self, x, y):
+        """
+        Return the top widget at a point or None.
+
+        Args:
+            x (int): column of the point
+            y (int): row of the point
+        """
+        for widget in reversed(self.widgets):
+            if widget.contains(x, y):
+                return widget
+
+        return None
+
+    def refresh(self):
+        """
+        Draw the damaged parts of the widgets, each clipped to the rectangle
+        of the widget. Widgets drawn over a damaged rectangle of a widget below
+        them are drawn again in that rectangle.
+
+        Returns:
+            int: number of widgets drawn
+        """
+        tft = self.tft
+        painted = []
+        for rect in self._cleared:
+            tft.fill_rect(
+                rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1], self.bg
+            )
+            painted.append(rect)
+
+        self._cleared = []
+        count = 0
+        for widget in self.widgets:
+            box = widget.box()
+            for rect in painted:
+                overlap = _intersect(rect, box)
+                if overlap is not None:
+                    widget._damage = _union(widget._damage, overlap)
+
+            damage = widget.damage(tft)
+            if damage is not None:
+                damage = _intersect(damage, box)
+
+            if damage is not None:
+                widget.paint(tft, damage)
+                painted.append(damage)
+                count += 1
+            else:
+                widget._damage = None
+
+        return count
@@ -38,14 +38,17 @@ This driver adds support for:
   multiples of 8.  Included are 12 bitmap fonts derived from classic pc
   BIOS text mode fonts.
 - Drawing text using converted TrueType fonts.
+- Drawing text using binary font files read from flash as glyphs are drawn.
 - Drawing converted bitmaps
 
 """
 
 from esp32 import RMT
+import math
 import time
 from micropython import const
 from machine import mem32, Pin
+from array import array
 import ustruct as struct
 
 # memory mapped registers of ESP32S3 for setting and clearing GPIO pins
@@ -55,144 +58,14 @@ GPIO_OUT_W1TC_REG = const(0x6000400C)
 GPIO_OUT1_W1TS_REG = const(0x60004014)
 GPIO_OUT1_W1TC_REG = const(0x60004018)
 
-# see the make_gpio_table script in the utils directory
-# of the repository for more information on these tables.
-GPIO_OUT_W1TC_MASK = const(0x00078308)
-GPIO_OUT1_W1TC_MASK = const(0x00004000)
-# fmt: off
-GPIO_OUT_W1TS_MASKS = (
-        0x0,   0x200,     0x0,   0x200,
-        0x8,   0x208,     0x8,   0x208,
-      0x100,   0x300,   0x100,   0x300,
-      0x108,   0x308,   0x108,   0x308,
-    0x40000, 0x40200, 0x40000, 0x40200,
-    0x40008, 0x40208, 0x40008, 0x40208,
-    0x40100, 0x40300, 0x40100, 0x40300,
-    0x40108, 0x40308, 0x40108, 0x40308,
-    0x20000, 0x20200, 0x20000, 0x20200,
-    0x20008, 0x20208, 0x20008, 0x20208,
-    0x20100, 0x20300, 0x20100, 0x20300,
-    0x20108, 0x20308, 0x20108, 0x20308,
-    0x60000, 0x60200, 0x60000, 0x60200,
-    0x60008, 0x60208, 0x60008, 0x60208,
-    0x60100, 0x60300, 0x60100, 0x60300,
-    0x60108, 0x60308, 0x60108, 0x60308,
-    0x10000, 0x10200, 0x10000, 0x10200,
-    0x10008, 0x10208, 0x10008, 0x10208,
-    0x10100, 0x10300, 0x10100, 0x10300,
-    0x10108, 0x10308, 0x10108, 0x10308,
-    0x50000, 0x50200, 0x50000, 0x50200,
-    0x50008, 0x50208, 0x50008, 0x50208,
-    0x50100, 0x50300, 0x50100, 0x50300,
-    0x50108, 0x50308, 0x50108, 0x50308,
-    0x30000, 0x30200, 0x30000, 0x30200,
-    0x30008, 0x30208, 0x30008, 0x30208,
-    0x30100, 0x30300, 0x30100, 0x30300,
-    0x30108, 0x30308, 0x30108, 0x30308,
-    0x70000, 0x70200, 0x70000, 0x70200,
-    0x70008, 0x70208, 0x70008, 0x70208,
-    0x70100, 0x70300, 0x70100, 0x70300,
-    0x70108, 0x70308, 0x70108, 0x70308,
-     0x8000,  0x8200,  0x8000,  0x8200,
-     0x8008,  0x8208,  0x8008,  0x8208,
-     0x8100,  0x8300,  0x8100,  0x8300,
-     0x8108,  0x8308,  0x8108,  0x8308,
-    0x48000, 0x48200, 0x48000, 0x48200,
-    0x48008, 0x48208, 0x48008, 0x48208,
-    0x48100, 0x48300, 0x48100, 0x48300,
-    0x48108, 0x48308, 0x48108, 0x48308,
-    0x28000, 0x28200, 0x28000, 0x28200,
-    0x28008, 0x28208, 0x28008, 0x28208,
-    0x28100, 0x28300, 0x28100, 0x28300,
-    0x28108, 0x28308, 0x28108, 0x28308,
-    0x68000, 0x68200, 0x68000, 0x68200,
-    0x68008, 0x68208, 0x68008, 0x68208,
-    0x68100, 0x68300, 0x68100, 0x68300,
-    0x68108, 0x68308, 0x68108, 0x68308,
-    0x18000, 0x18200, 0x18000, 0x18200,
-    0x18008, 0x18208, 0x18008, 0x18208,
-    0x18100, 0x18300, 0x18100, 0x18300,
-    0x18108, 0x18308, 0x18108, 0x18308,
-    0x58000, 0x58200, 0x58000, 0x58200,
-    0x58008, 0x58208, 0x58008, 0x58208,
-    0x58100, 0x58300, 0x58100, 0x58300,
-    0x58108, 0x58308, 0x58108, 0x58308,
-    0x38000, 0x38200, 0x38000, 0x38200,
-    0x38008, 0x38208, 0x38008, 0x38208,
-    0x38100, 0x38300, 0x38100, 0x38300,
-    0x38108, 0x38308, 0x38108, 0x38308,
-    0x78000, 0x78200, 0x78000, 0x78200,
-    0x78008, 0x78208, 0x78008, 0x78208,
-    0x78100, 0x78300, 0x78100, 0x78300,
-    0x78108, 0x78308, 0x78108, 0x78308,
-)
-GPIO_OUT1_W1TS_MASKS = (
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-        0x0,     0x0,  0x4000,  0x4000,
-)
-# fmt: on
+# Data bus pins of the WT32-SC01 Plus, d0 through d7. The GPIO mask tables
+# used to put a byte on the bus are built from this map when the driver is
+# initialized, see the make_gpio_table script in the utils directory of the
+# repository for more information on these tables.
+DATA_PINS = (9, 46, 3, 8, 18, 17, 16, 15)
+
+# file used to cache the GPIO mask tables in flash after the first boot
+GPIO_MASK_CACHE = "gpio_masks.bin"
 
 
 # GPIO Pin Masks for setting and clearing pins
@@ -258,11 +131,19 @@ MAGENTA = const(0xF81F)
 YELLOW = const(0xFFE0)
 WHITE = const(0xFFFF)
 
+# Gradient directions
+HORIZONTAL = const(0)
+VERTICAL = const(1)
+
 _ENCODE_PIXEL = const(">H")
 _ENCODE_POS = const(">HH")
 _DECODE_PIXEL = const(">BBB")
 
 _BUFFER_SIZE = const(256)
+_FILE_BUFFER_SIZE = const(1024)
+_RUN_CACHE_SIZE = const(128)
+_BLEND_CACHE_SIZE = const(16)
+_AA_LEVELS = const(16)
 
 _BIT7 = const(0x80)
 _BIT6 = const(0x40)
@@ -302,6 +183,295 @@ def _encode_pixel(color):
     return struct.pack(_ENCODE_PIXEL, color)
 
 
+def _make_gpio_masks(pins):
+    """
+    Build the GPIO_OUT_W1TS_REG and GPIO_OUT1_W1TS_REG masks for every byte
+    value from a list of the GPIO pins used for data bits 0 through 7.
+
+    Args:
+        pins (tuple): GPIO pin numbers for data bits 0 through 7
+
+    Returns:
+        tuple: (out_masks, out1_masks) 256 entry arrays of 32 bit masks
+    """
+    out_masks = array("I", bytes(1024))
+    out1_masks = array("I", bytes(1024))
+    for bit, pin in enumerate(pins):
+        step = 1 << bit
+        out = 1 << pin if pin < 32 else 0
+        out1 = 1 << (pin - 32) if pin >= 32 else 0
+        for b in range(step):
+            out_masks[b | step] = out_masks[b] | out
+            out1_masks[b | step] = out1_masks[b] | out1
+
+    return out_masks, out1_masks
+
+
+def _load_gpio_masks(pins, cache=None):
+    """
+    Load the GPIO mask tables for the data pins from the cache file, building
+    and saving them if the cache is missing or was made for other pins.
+
+    Args:
+        pins (tuple): GPIO pin numbers for data bits 0 through 7
+        cache (str): name of the cache file or None to disable caching
+
+    Returns:
+        tuple: (out_masks, out1_masks) 256 entry arrays of 32 bit masks
+    """
+    if cache is not None:
+        out_masks = array("I", bytes(1024))
+        out1_masks = array("I", bytes(1024))
+        try:
+            with open(cache, "rb") as cache_file:
+                if (
+                    cache_file.read(8) == bytes(pins)
+                    and cache_file.readinto(out_masks) == 1024
+                    and cache_file.readinto(out1_masks) == 1024
+                ):
+                    return out_masks, out1_masks
+        except OSError:
+            pass
+
+    out_masks, out1_masks = _make_gpio_masks(pins)
+
+    if cache is not None:
+        try:
+            with open(cache, "wb") as cache_file:
+                cache_file.write(bytes(pins))
+                cache_file.write(out_masks)
+                cache_file.write(out1_masks)
+        except OSError:
+            pass
+
+    return out_masks, out1_masks
+
+
+class BinaryFont:
+    """
+    A font read from a binary font file written by the --binary option of
+    font2bitmap.py or font_from_romfont.py. Only the header and the character
+    index are loaded into memory, glyph bitmaps are read from the file when
+    they are drawn and the most recently drawn glyphs are cached. A BinaryFont
+    can be used anywhere the matching font module can be used.
+
+    Args:
+        filename (str): name of the binary font file
+        cache_size (int): number of glyphs to cache, defaults to 16
+    """
+
+    def __init__(self, filename, cache_size=16):
+        self._file = open(filename, "rb")
+        magic = self._file.read(4)
+        if magic == b"WTFR":
+            self.WIDTH, self.HEIGHT, self.FIRST, self.LAST = struct.unpack(
+                "<BBHH", self._file.read(6)
+            )
+        elif magic == b"WTFT":
+            (
+                self.BPP,
+                self.OFFSET_WIDTH,
+                bboxes,
+                self.KERNING_WIDTH,
+                self.HEIGHT,
+                self.MAX_WIDTH,
+                self.BASELINE,
+                count,
+                map_size,
+                kerning_size,
+            ) = struct.unpack("<BBBBHHHHII", self._file.read(20))
+            self.MAP = self._file.read(map_size).decode()
+            self.WIDTHS = memoryview(self._file.read(count))
+            self.OFFSETS = memoryview(self._file.read(count * self.OFFSET_WIDTH))
+            if bboxes:
+                self.BBOXES = memoryview(self._file.read(count * 4))
+            if kerning_size:
+                self.KERNING = memoryview(self._file.read(kerning_size))
+        else:
+            self._file.close()
+            raise ValueError("Not a binary font file")
+
+        self._bitmaps = self._file.tell()
+        self._cache_size = cache_size
+        self._glyphs = {}
+
+    def glyph(self, bit, bits):
+        """
+        Return a buffer holding the bitmap of a glyph and the bit offset of the
+        glyph in the buffer.
+
+        Args:
+            bit (int): bit offset of the glyph in the font bitmaps
+            bits (int): number of bits in the glyph bitmap
+        """
+        # glyphs can share their first byte, so the cache is keyed by bit
+        data = self._glyphs.get(bit)
+        if data is None:
+            if len(self._glyphs) >= self._cache_size:
+                self._glyphs.clear()
+
+            start = bit // 8
+            data = bytearray((bit + bits + 7) // 8 - start)
+            self._file.seek(self._bitmaps + start)
+            self._file.readinto(data)
+            self._glyphs[bit] = data
+
+        return data, bit % 8
+
+    def close(self):
+        """Close the font file."""
+        self._file.close()
+
+
+class FontChain:
+    """
+    A chain of converted true-type font modules or BinaryFonts that the write
+    and write_width methods use as a single font. Each character is drawn
+    using the first font in the chain that contains it, with the baselines of
+    the fonts aligned. The font found for each character is cached so it is
+    only searched for once. Fonts converted without a BASELINE are aligned on
+    the bottom of their character cells.
+
+    Args:
+        fonts (font): fonts to search for each character, in order
+        cache_size (int): number of characters to cache, defaults to 256
+    """
+
+    def __init__(self, *fonts, cache_size=256):
+        baselines = [getattr(font, "BASELINE", font.HEIGHT) for font in fonts]
+        self.BASELINE = max(baselines)
+        self.HEIGHT = self.BASELINE + max(
+            font.HEIGHT - baseline for font, baseline in zip(fonts, baselines)
+        )
+        self.MAX_WIDTH = max(font.MAX_WIDTH for font in fonts)
+        self._fonts = tuple(
+            (font, self.BASELINE - baseline) for font, baseline in zip(fonts, baselines)
+        )
+        self._cache_size = cache_size
+        self._chars = {}
+
+    def resolve(self, char):
+        """
+        Return the font, the MAP index and the row offset in the chain's
+        character cell used to draw a character.
+
+        Args:
+            char (str): character to resolve
+
+        Raises:
+            ValueError: if no font in the chain contains the character
+        """
+        glyph = self._chars.get(char)
+        if glyph is None:
+            glyph = ()
+            for font, dy in self._fonts:
+                index = font.MAP.find(char)
+                if index >= 0:
+                    glyph = (font, index, dy)
+                    break
+
+            if len(self._chars) >= self._cache_size:
+                self._chars.clear()
+
+            self._chars[char] = glyph
+
+        if not glyph:
+            raise ValueError("character not in font chain")
+
+        return glyph
+
+
+class TextImage:
+    """
+    A string rendered into big endian 565 encoded pixels by the render_text
+    method. A TextImage has the attributes of a bitmap module converted with
+    the --raw565 option, the bitmap method draws it in one window without
+    decoding any glyphs.
+
+    Args:
+        width (int): width of the image
+        height (int): height of the image
+        bitmap (bytearray): pixels of the image
+    """
+
+    BPP = 16
+
+    def __init__(self, width, height, bitmap):
+        self.WIDTH = width
+        self.HEIGHT = height
+        self.BITMAP = memoryview(bitmap)
+
+
+class TextImagePool:
+    """
+    Rendered strings cached within a budget of bytes. When an image does not
+    fit in the budget the least recently used images are dropped, images
+    larger than the budget are rendered but not cached.
+
+    Args:
+        tft (WT32SC01): display driver
+        budget (int): bytes of pixels to keep, defaults to 32768
+    """
+
+    def __init__(self, tft, budget=32768):
+        self.tft = tft
+        self.budget = budget
+        self.used = 0
+        self._images = {}
+        self._tick = 0
+
+    def image(self, font, string, fg=WHITE, bg=BLACK):
+        """
+        Return the TextImage of a string, rendering it if it is not cached.
+
+        Args:
+            font (font): rom font module, converted true-type font module,
+                BinaryFont or FontChain
+            string (string): The string to render
+            fg (int): foreground color, optional, defaults to WHITE
+            bg (int): background color, optional, defaults to BLACK
+        """
+        self._tick += 1
+        key = (font, string, fg, bg)
+        entry = self._images.get(key)
+        if entry is not None:
+            entry[1] = self._tick
+            return entry[0]
+
+        image = self.tft.render_text(font, string, fg, bg)
+        size = len(image.BITMAP)
+        if size > self.budget:
+            return image
+
+        while self.used + size > self.budget:
+            oldest = min(self._images, key=lambda k: self._images[k][1])
+            self.used -= len(self._images.pop(oldest)[0].BITMAP)
+
+        self._images[key] = [image, self._tick]
+        self.used += size
+        return image
+
+    def draw(self, font, string, x, y, fg=WHITE, bg=BLACK):
+        """
+        Draw a string from its cached TextImage.
+
+        Args:
+            font (font): rom font module, converted true-type font module,
+                BinaryFont or FontChain
+            string (string): The string to draw
+            x (int): column to start drawing at
+            y (int): row to start drawing at
+            fg (int): foreground color, optional, defaults to WHITE
+            bg (int): background color, optional, defaults to BLACK
+        """
+        self.tft.bitmap(self.image(font, string, fg, bg), x, y)
+
+    def clear(self):
+        """Drop all of the cached images."""
+        self._images = {}
+        self.used = 0
+
+
 class WT32SC01:
     """
     WT32SC01 driver class
@@ -314,25 +484,34 @@ class WT32SC01:
             - 3-Inverted Landscape
 
         rotations (list): list of rotation values
+
+        data_pins (tuple): GPIO pins used for data bits 0 through 7
+
+        mask_cache (str): file to cache the GPIO mask tables in or None to
+            build the tables on every boot
     """
 
     def __init__(
         self,
         rotation=0,
         rotations=ROTATIONS,
+        data_pins=DATA_PINS,
+        mask_cache=GPIO_MASK_CACHE,
     ):
         """
         Initialize WT32SC01's st7789 display.
         """
+        if len(data_pins) != 8:
+            raise ValueError("data_pins must list 8 GPIO pins")
 
-        Pin(15, Pin.OUT)  # d7
-        Pin(16, Pin.OUT)  # d6
-        Pin(17, Pin.OUT)  # d5
-        Pin(18, Pin.OUT)  # d4
-        Pin(8, Pin.OUT)  # d3
-        Pin(3, Pin.OUT)  # d2
-        Pin(46, Pin.OUT)  # d1
-        Pin(9, Pin.OUT)  # d0
+        for pin in data_pins:
+            Pin(pin, Pin.OUT)
+
+        self._out_masks, self._out1_masks = _load_gpio_masks(
+            tuple(data_pins), mask_cache
+        )
+        self._out_clear = self._out_masks[255]
+        self._out1_clear = self._out1_masks[255]
 
         self.wr = Pin(PIN_WR, Pin.OUT, value=1)  # wr
         self.rmt = RMT(1, pin=self.wr, clock_div=5)
@@ -343,7 +522,13 @@ class WT32SC01:
         self.cs = Pin(6, Pin.OUT)  # cs
         self.bl = Pin(45, Pin.OUT)  # backlight0
 
-        self.last = None
+        self._strobes = [0, 1] * (_BUFFER_SIZE * 2)
+        self._trains = []
+        pixels = 1
+        while pixels < _BUFFER_SIZE:
+            self._trains.append([0, 1] * (pixels * 2))
+            pixels <<= 1
+        self._init_state()
         self._rotation = rotation % 4
         self._rotations = rotations
 
@@ -363,6 +548,27 @@ class WT32SC01:
         self._write(ST7796_DISPON)
         time.sleep_ms(125)
 
+    def _init_state(self):
+        """
+        Set the data bus, drawing and cache state used by the drawing methods,
+        shared by the display and the canvases of render_text.
+        """
+        self.last = None
+        self._last_out = None
+        self._last_out1 = None
+        self._counting = False
+        self._changes = 0
+        self._out_writes = 0
+        self._out1_writes = 0
+        self._file_buffer = None
+        self._runs = {}
+        self._blend_tables = {}
+        self._scale_tables = {}
+        self._widths = {}
+        self._polygon = None
+        self._clip = (0, 0, 0, 0)
+        self._clip_stack = []
+
     def reset_on(self):
         self.rst.value(1)
 
@@ -375,16 +581,89 @@ class WT32SC01:
     def backlight_off(self):
         self.bl.value(0)
 
+    def count_stats(self, enable=True):
+        """
+        Enable or disable counting of the data bus statistics. Counting adds
+        a method call to every data byte change, so it is off by default.
+
+        Args:
+            enable (bool): if True count data byte changes and register writes
+        """
+        self._counting = enable
+
+    def stats(self, reset=False):
+        """
+        Return data bus statistics, see count_stats.
+
+        Args:
+            reset (bool): if True reset the counters after reading them
+
+        Returns:
+            dict: counts of data byte changes, GPIO_OUT and GPIO_OUT1 register
+            writes and the register writes skipped because a bank's pins were
+            already in the right state.
+        """
+        result = {
+            "changes": self._changes,
+            "out_writes": self._out_writes,
+            "out1_writes": self._out1_writes,
+            "skipped": 4 * self._changes - self._out_writes - self._out1_writes,
+        }
+        if reset:
+            self._changes = 0
+            self._out_writes = 0
+            self._out1_writes = 0
+
+        return result
+
+    @micropython.native
+    def _set_data(self, b):
+        """
+        Put a byte on the data pins, only writing the registers of the GPIO
+        banks whose pins change.
+        """
+        out = self._out_masks[b]
+        if out != self._last_out:
+            mem32[GPIO_OUT_W1TS_REG] = out
+            mem32[GPIO_OUT_W1TC_REG] = out ^ self._out_clear
+            self._last_out = out
+            if self._counting:
+                self._out_writes += 2
+
+        out1 = self._out1_masks[b]
+        if out1 != self._last_out1:
+            mem32[GPIO_OUT1_W1TS_REG] = out1
+            mem32[GPIO_OUT1_W1TC_REG] = out1 ^ self._out1_clear
+            self._last_out1 = out1
+            if self._counting:
+                self._out1_writes += 2
+
+        if self._counting:
+            self._changes += 1
+
+        self.last = b
+
     @micropython.native
     def _write_byte(self, b):
         """Write to the display using 8 bit parallel mode. Note: this is not fast."""
         if b != self.last:
-            out = GPIO_OUT_W1TS_MASKS[b]
-            out1 = GPIO_OUT1_W1TS_MASKS[b]
-            mem32[GPIO_OUT_W1TS_REG] = out
-            mem32[GPIO_OUT1_W1TS_REG] = out1
-            mem32[GPIO_OUT_W1TC_REG] = out ^ GPIO_OUT_W1TC_MASK
-            mem32[GPIO_OUT1_W1TC_REG] = out1 ^ GPIO_OUT1_W1TC_MASK
+            if self._counting:
+                self._set_data(b)
+                self.rmt.write_pulses(2, self.pulse)
+                return
+
+            out = self._out_masks[b]
+            if out != self._last_out:
+                mem32[GPIO_OUT_W1TS_REG] = out
+                mem32[GPIO_OUT_W1TC_REG] = out ^ self._out_clear
+                self._last_out = out
+
+            out1 = self._out1_masks[b]
+            if out1 != self._last_out1:
+                mem32[GPIO_OUT1_W1TS_REG] = out1
+                mem32[GPIO_OUT1_W1TC_REG] = out1 ^ self._out1_clear
+                self._last_out1 = out1
+
             self.last = b
 
         self.rmt.write_pulses(2, self.pulse)
@@ -406,6 +685,46 @@ class WT32SC01:
 
         mem32[GPIO_OUT_W1TS_REG] = MASK_CS
 
+    @micropython.native
+    def _write_run(self, color, count):
+        """
+        Write count pixels of the same color to the display. When both bytes
+        of the color are the same the data pins are set once and the pixels
+        are sent as trains of write strobes, the remainder with one prebuilt
+        train per set bit of its count so nothing is allocated.
+
+        Args:
+            color (int): 565 encoded color
+            count (int): number of pixels to write
+        """
+        chunks, rest = divmod(count, _BUFFER_SIZE)
+        hi = color >> 8
+        if hi == color & 0xFF:
+            mem32[GPIO_OUT_W1TC_REG] = MASK_CS
+            mem32[GPIO_OUT_W1TS_REG] = MASK_DC
+            if hi != self.last:
+                self._set_data(hi)
+
+            for _ in range(chunks):
+                self.rmt.write_pulses(2, self._strobes)
+                self.rmt.wait_done()
+            for train in self._trains:
+                if rest & 1:
+                    self.rmt.write_pulses(2, train)
+                    self.rmt.wait_done()
+
+                rest >>= 1
+
+            mem32[GPIO_OUT_W1TS_REG] = MASK_CS
+        else:
+            pixel = _encode_pixel(color)
+            if chunks:
+                data = pixel * _BUFFER_SIZE
+                for _ in range(chunks):
+                    self._write(None, data)
+            if rest:
+                self._write(None, pixel * rest)
+
     def hard_reset(self):
         """
         Hard reset display.
@@ -480,6 +799,109 @@ class WT32SC01:
         madctl = self._rotations[rotation]
         self.width, self.height = WIDTH_480[rotation]
         self._write(ST7796_MADCTL, bytes([madctl]))
+        self.reset_clip()
+
+    def set_clip(self, x, y, width, height):
+        """
+        Set the clip rectangle. Drawing is limited to the part of the clip
+        rectangle that is on the display.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            width (int): Width in pixels
+            height (int): Height in pixels
+        """
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + width, self.width) - 1
+        y1 = min(y + height, self.height) - 1
+        self._clip = (x0, y0, x1, y1)
+
+    def reset_clip(self):
+        """
+        Reset the clip rectangle to the whole display and empty the clip
+        stack.
+        """
+        self._clip = (0, 0, self.width - 1, self.height - 1)
+        self._clip_stack = []
+
+    def push_clip(self, x, y, width, height):
+        """
+        Save the clip rectangle on the clip stack and limit drawing to the
+        part of the given rectangle that is inside the current clip
+        rectangle.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            width (int): Width in pixels
+            height (int): Height in pixels
+        """
+        clip = self._clip
+        self._clip_stack.append(clip)
+        x0 = max(x, clip[0])
+        y0 = max(y, clip[1])
+        x1 = min(x + width - 1, clip[2])
+        y1 = min(y + height - 1, clip[3])
+        self._clip = (x0, y0, x1, y1)
+
+    def pop_clip(self):
+        """
+        Restore the clip rectangle saved by the last push_clip.
+        """
+        if self._clip_stack:
+            self._clip = self._clip_stack.pop()
+
+    def get_clip(self):
+        """
+        Return the clip rectangle.
+
+        Returns:
+            tuple: (x, y, width, height) of the clip rectangle
+        """
+        x0, y0, x1, y1 = self._clip
+        return x0, y0, max(x1 - x0 + 1, 0), max(y1 - y0 + 1, 0)
+
+    @micropython.native
+    def _clip_rect(self, x, y, width, height):
+        """
+        Return the visible part of a rectangle as (x0, y0, x1, y1) or None if
+        none of the rectangle is visible.
+        """
+        clip = self._clip
+        x0 = max(x, clip[0])
+        y0 = max(y, clip[1])
+        x1 = min(x + width - 1, clip[2])
+        y1 = min(y + height - 1, clip[3])
+        if x0 > x1 or y0 > y1:
+            return None
+
+        return x0, y0, x1, y1
+
+    @micropython.native
+    def _write_rows(self, buffer, start, width, col, cols, rows):
+        """
+        Write the visible columns of rows of pixels in a buffer to the current
+        window.
+
+        Args:
+            buffer (buffer): buffer holding rows of width pixels
+            start (int): index of the first visible row in the buffer
+            width (int): width of the rows in the buffer in pixels
+            col (int): first visible column
+            cols (int): number of visible columns
+            rows (int): number of visible rows
+        """
+        if cols == width:
+            start *= width * 2
+            self._write(None, buffer[start : start + width * rows * 2])
+            return
+
+        start = (start * width + col) * 2
+        for _ in range(rows):
+            self._write(None, buffer[start : start + cols * 2])
+            start += width * 2
 
     @micropython.native
     def _set_window(self, x0, y0, x1, y1):
@@ -530,8 +952,10 @@ class WT32SC01:
             Y (int): y coordinate
             color (int): 565 encoded color
         """
-        self._set_window(x, y, x, y)
-        self._write(None, _encode_pixel(color))
+        clip = self._clip
+        if clip[0] <= x <= clip[2] and clip[1] <= y <= clip[3]:
+            self._set_window(x, y, x, y)
+            self._write(None, _encode_pixel(color))
 
     def blit_buffer(self, buffer, x, y, width, height):
         """
@@ -544,8 +968,71 @@ class WT32SC01:
             width (int): Width
             height (int): Height
         """
-        self._set_window(x, y, x + width - 1, y + height - 1)
-        self._write(None, buffer)
+        clip = self._clip_rect(x, y, width, height)
+        if clip is None:
+            return
+
+        x0, y0, x1, y1 = clip
+        self._set_window(x0, y0, x1, y1)
+        if not isinstance(buffer, memoryview):
+            buffer = memoryview(buffer)
+        self._write_rows(buffer, y0 - y, width, x0 - x, x1 - x0 + 1, y1 - y0 + 1)
+
+    def blit_file(self, fileobj, x, y, width, height, offset=0, stride=None):
+        """
+        Copy raw RGB565 pixel data from a file to the display at the given
+        location without loading the image into memory. The data is streamed
+        through a small reusable buffer, each chunk is read and then sent. The
+        reads do not overlap the bus output, the CPU puts every data byte on
+        the bus so there is no transfer running while a read is waiting.
+
+        To draw part of a larger image set stride to the length of the image
+        rows in bytes and offset to the position of the first pixel of the
+        part to draw.
+
+        Args:
+            fileobj (file): file object opened in binary mode
+            x (int): Top left corner x coordinate
+            Y (int): Top left corner y coordinate
+            width (int): Width
+            height (int): Height
+            offset (int): position in the file of the first pixel to copy
+            stride (int): length of the image rows in the file in bytes,
+                defaults to width * 2
+        """
+        if stride is None:
+            stride = width * 2
+
+        clip = self._clip_rect(x, y, width, height)
+        if clip is None:
+            return
+
+        x0, y0, x1, y1 = clip
+        offset += (y0 - y) * stride + (x0 - x) * 2
+        width = x1 - x0 + 1
+        height = y1 - y0 + 1
+        row_len = width * 2
+
+        if self._file_buffer is None:
+            self._file_buffer = memoryview(bytearray(_FILE_BUFFER_SIZE))
+
+        buffer = self._file_buffer
+        self._set_window(x0, y0, x1, y1)
+        if stride == row_len:
+            rows = 1
+            row_len *= height
+        else:
+            rows = height
+
+        for row in range(rows):
+            fileobj.seek(offset + row * stride)
+            remaining = row_len
+            while remaining:
+                count = fileobj.readinto(buffer[: min(remaining, _FILE_BUFFER_SIZE)])
+                if not count:
+                    return
+                self._write(None, buffer[:count])
+                remaining -= count
 
     def rect(self, x, y, w, h, color):
         """
@@ -575,19 +1062,105 @@ class WT32SC01:
             height (int): Height in pixels
             color (int): 565 encoded color
         """
-        self._set_window(x, y, x + width - 1, y + height - 1)
-        chunks, rest = divmod(width * height, _BUFFER_SIZE)
-        pixel = _encode_pixel(color)
-        mem32[GPIO_OUT_W1TC_REG] = MASK_CS
-        mem32[GPIO_OUT_W1TS_REG] = MASK_DC
-        if chunks:
-            data = pixel * _BUFFER_SIZE
-            for _ in range(chunks):
-                self._write(None, data)
-        if rest:
-            self._write(None, pixel * rest)
+        clip = self._clip_rect(x, y, width, height)
+        if clip is not None:
+            x0, y0, x1, y1 = clip
+            self._set_window(x0, y0, x1, y1)
+            self._write_run(color, (x1 - x0 + 1) * (y1 - y0 + 1))
 
-        mem32[GPIO_OUT_W1TS_REG] = MASK_CS
+    def fill_gradient(self, x, y, width, height, c0, c1, direction=HORIZONTAL):
+        """
+        Draw a rectangle filled with a linear gradient in one window. The
+        ramp of colors is built once with the blend tables and cached by its
+        end colors and length. Horizontal gradients send the same row buffer
+        for every row, vertical gradients send each row as a burst of one
+        color.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            width (int): Width in pixels
+            height (int): Height in pixels
+            c0 (int): 565 encoded color at the left or top
+            c1 (int): 565 encoded color at the right or bottom
+            direction (int): HORIZONTAL or VERTICAL, defaults to HORIZONTAL
+        """
+        clip = self._clip_rect(x, y, width, height)
+        if clip is None:
+            return
+
+        x0, y0, x1, y1 = clip
+        length = width if direction == HORIZONTAL else height
+        if length < 2:
+            self.fill_rect(x0, y0, x1 - x0 + 1, y1 - y0 + 1, c0)
+            return
+
+        ramp = memoryview(self._blend_table(c1, c0, length))
+        self._set_window(x0, y0, x1, y1)
+        if direction == HORIZONTAL:
+            row = ramp[(x0 - x) * 2 : (x1 - x + 1) * 2]
+            for _ in range(y1 - y0 + 1):
+                self._write(None, row)
+            return
+
+        # rows of the same color are sent as one burst
+        cols = x1 - x0 + 1
+        color = ramp[(y0 - y) * 2] << 8 | ramp[(y0 - y) * 2 + 1]
+        rows = 0
+        for i in range((y0 - y) * 2, (y1 - y + 1) * 2, 2):
+            row_color = ramp[i] << 8 | ramp[i + 1]
+            if row_color != color:
+                self._write_run(color, cols * rows)
+                color = row_color
+                rows = 0
+
+            rows += 1
+
+        self._write_run(color, cols * rows)
+
+    def fill_pattern(self, x, y, width, height, tile):
+        """
+        Draw a rectangle filled with copies of a tile in one window. A row
+        buffer is built once for each row of the tile and the rows of the
+        rectangle are sent from them. The tile starts at the top left corner
+        of the rectangle.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            width (int): Width in pixels
+            height (int): Height in pixels
+            tile (bitmap_module): bitmap module converted with the --raw565
+                option or a TextImage
+        """
+        if tile.BPP != 16:
+            raise ValueError("tile must be a 16 bit bitmap")
+
+        clip = self._clip_rect(x, y, width, height)
+        if clip is None:
+            return
+
+        x0, y0, x1, y1 = clip
+        tile_width = tile.WIDTH * 2
+        size = (x1 - x0 + 1) * 2
+        phase = (x0 - x) % tile.WIDTH * 2
+        bitmap = memoryview(tile.BITMAP)
+        rows = []
+        for start in range(0, tile.HEIGHT * tile_width, tile_width):
+            source = bitmap[start : start + tile_width]
+            row = bytearray(size)
+            count = min(tile_width - phase, size)
+            row[:count] = source[phase : phase + count]
+            while count < size:
+                part = min(tile_width, size - count)
+                row[count : count + part] = source[:part]
+                count += part
+
+            rows.append(row)
+
+        self._set_window(x0, y0, x1, y1)
+        for i in range(y0 - y, y1 - y + 1):
+            self._write(None, rows[i % tile.HEIGHT])
 
     def fill(self, color):
         """
@@ -618,13 +1191,7 @@ class WT32SC01:
 
         self._set_window(0, 0, self.width, self.height)
 
-        out = GPIO_OUT_W1TS_MASKS[color]
-        out1 = GPIO_OUT1_W1TS_MASKS[color]
-
-        mem32[GPIO_OUT_W1TS_REG] = out
-        mem32[GPIO_OUT1_W1TS_REG] = out1
-        mem32[GPIO_OUT_W1TC_REG] = out ^ GPIO_OUT_W1TC_MASK
-        mem32[GPIO_OUT1_W1TC_REG] = out1 ^ GPIO_OUT1_W1TC_MASK
+        self._set_data(color)
 
         mem32[GPIO_OUT_W1TC_REG] = MASK_CS
         mem32[GPIO_OUT_W1TS_REG] = MASK_DC
@@ -672,6 +1239,562 @@ class WT32SC01:
                 err += dx
             x0 += 1
 
+    def _round_widths(self, rx, ry):
+        """
+        Return the half width of each row of an ellipse from its center row
+        to its top row, computed with the midpoint ellipse algorithm or the
+        midpoint circle algorithm when rx equals ry. Widths are cached per
+        (rx, ry).
+
+        Args:
+            rx (int): horizontal radius
+            ry (int): vertical radius
+        """
+        key = (rx, ry)
+        widths = self._widths.get(key)
+        if widths is not None:
+            return widths
+
+        widths = bytearray(ry + 1) if rx < 256 else [0] * (ry + 1)
+        if rx == 0 or ry == 0:
+            for y in range(ry + 1):
+                widths[y] = rx
+        elif rx == ry:
+            x = 0
+            y = ry
+            d = 1 - ry
+            while x <= y:
+                widths[y] = max(widths[y], x)
+                widths[x] = max(widths[x], y)
+                x += 1
+                if d < 0:
+                    d += 2 * x + 1
+                else:
+                    y -= 1
+                    d += 2 * (x - y) + 1
+        else:
+            rx2 = rx * rx
+            ry2 = ry * ry
+            x = 0
+            y = ry
+            dx = 0
+            dy = 2 * rx2 * y
+            d = ry2 - rx2 * ry + rx2 / 4
+            while dx < dy:
+                widths[y] = x
+                x += 1
+                dx += 2 * ry2
+                if d < 0:
+                    d += ry2 + dx
+                else:
+                    y -= 1
+                    dy -= 2 * rx2
+                    d += ry2 + dx - dy
+
+            d = ry2 * (x + 0.5) * (x + 0.5) + rx2 * (y - 1) * (y - 1) - rx2 * ry2
+            while y >= 0:
+                widths[y] = max(widths[y], x)
+                y -= 1
+                dy -= 2 * rx2
+                if d > 0:
+                    d += rx2 - dy
+                else:
+                    x += 1
+                    dx += 2 * ry2
+                    d += rx2 - dy + dx
+
+            # very flat ellipses leave the second region before reaching rx
+            widths[0] = rx
+
+        if len(self._widths) >= _BLEND_CACHE_SIZE:
+            self._widths.clear()
+
+        self._widths[key] = widths
+        return widths
+
+    def _round_outline(self, x0, y0, x1, y1, widths, color):
+        """
+        Draw the four quarters of a round outline, the left quarters centered
+        on column x0, the right on x1, the top on row y0 and the bottom on
+        row y1. The outline pixels of each row form one span and rows with
+        the same span are drawn as one rectangle, so flat parts of the outline
+        are horizontal lines and steep parts vertical lines.
+
+        Args:
+            x0 (int): center column of the left quarters
+            y0 (int): center row of the top quarters
+            x1 (int): center column of the right quarters
+            y1 (int): center row of the bottom quarters
+            widths (buffer): half width of each row from _round_widths
+            color (int): 565 encoded color
+        """
+        last = len(widths) - 1
+        row = 0
+        while row <= last:
+            high = widths[row]
+            low = min(high, widths[row + 1] + 1) if row < last else 0
+            end = row
+            while end < last:
+                after = widths[end + 1]
+                if after != high:
+                    break
+                if end + 1 < last:
+                    after = min(after, widths[end + 2] + 1)
+                else:
+                    after = 0
+                if after != low:
+                    break
+                end += 1
+
+            width = high - low + 1
+            rows = end - row + 1
+            left = x0 - high
+            left_width = width if x0 != x1 or low else width - 1
+            top_rows = rows if y0 != y1 or row else rows - 1
+            self.fill_rect(x1 + low, y1 + row, width, rows, color)
+            self.fill_rect(left, y1 + row, left_width, rows, color)
+            self.fill_rect(x1 + low, y0 - end, width, top_rows, color)
+            self.fill_rect(left, y0 - end, left_width, top_rows, color)
+            row = end + 1
+
+    def _round_fill(self, x0, y0, x1, y1, widths, color):
+        """
+        Fill the rows of a round shape, each row from x0 to x1 widened by its
+        half width, the rows below y1 and above y0. Rows of the same width
+        are filled as one rectangle.
+
+        Args:
+            x0 (int): center column of the left side
+            y0 (int): center row of the top side
+            x1 (int): center column of the right side
+            y1 (int): center row of the bottom side
+            widths (buffer): half width of each row from _round_widths
+            color (int): 565 encoded color
+        """
+        last = len(widths) - 1
+        row = 0
+        while row <= last:
+            width = widths[row]
+            end = row
+            while end < last and widths[end + 1] == width:
+                end += 1
+
+            rows = end - row + 1
+            span = x1 - x0 + 1 + width * 2
+            self.fill_rect(x0 - width, y1 + row, span, rows, color)
+            self.fill_rect(
+                x0 - width, y0 - end, span, rows if y0 != y1 or row else rows - 1, color
+            )
+            row = end + 1
+
+    def circle(self, x, y, r, color):
+        """
+        Draw a circle outline using the midpoint circle algorithm.
+
+        Args:
+            x (int): center column
+            y (int): center row
+            r (int): radius
+            color (int): 565 encoded color
+        """
+        self._round_outline(x, y, x, y, self._round_widths(r, r), color)
+
+    def fill_circle(self, x, y, r, color):
+        """
+        Draw a filled circle using the midpoint circle algorithm.
+
+        Args:
+            x (int): center column
+            y (int): center row
+            r (int): radius
+            color (int): 565 encoded color
+        """
+        self._round_fill(x, y, x, y, self._round_widths(r, r), color)
+
+    def ellipse(self, x, y, rx, ry, color):
+        """
+        Draw an ellipse outline using the midpoint ellipse algorithm.
+
+        Args:
+            x (int): center column
+            y (int): center row
+            rx (int): horizontal radius
+            ry (int): vertical radius
+            color (int): 565 encoded color
+        """
+        self._round_outline(x, y, x, y, self._round_widths(rx, ry), color)
+
+    def fill_ellipse(self, x, y, rx, ry, color):
+        """
+        Draw a filled ellipse using the midpoint ellipse algorithm.
+
+        Args:
+            x (int): center column
+            y (int): center row
+            rx (int): horizontal radius
+            ry (int): vertical radius
+            color (int): 565 encoded color
+        """
+        self._round_fill(x, y, x, y, self._round_widths(rx, ry), color)
+
+    def round_rect(self, x, y, w, h, r, color):
+        """
+        Draw a rectangle with rounded corners.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            w (int): Width in pixels
+            h (int): Height in pixels
+            r (int): radius of the corners, limited to half the width and
+                height
+            color (int): 565 encoded color
+        """
+        r = max(0, min(r, (w - 1) // 2, (h - 1) // 2))
+        x0 = x + r
+        y0 = y + r
+        x1 = x + w - 1 - r
+        y1 = y + h - 1 - r
+        self._round_outline(x0, y0, x1, y1, self._round_widths(r, r), color)
+        self.hline(x0 + 1, y, x1 - x0 - 1, color)
+        self.hline(x0 + 1, y + h - 1, x1 - x0 - 1, color)
+        self.vline(x, y0 + 1, y1 - y0 - 1, color)
+        self.vline(x + w - 1, y0 + 1, y1 - y0 - 1, color)
+
+    def fill_round_rect(self, x, y, w, h, r, color):
+        """
+        Draw a filled rectangle with rounded corners.
+
+        Args:
+            x (int): Top left corner x coordinate
+            y (int): Top left corner y coordinate
+            w (int): Width in pixels
+            h (int): Height in pixels
+            r (int): radius of the corners, limited to half the width and
+                height
+            color (int): 565 encoded color
+        """
+        r = max(0, min(r, (w - 1) // 2, (h - 1) // 2))
+        x0 = x + r
+        y0 = y + r
+        x1 = x + w - 1 - r
+        y1 = y + h - 1 - r
+        self._round_fill(x0, y0, x1, y1, self._round_widths(r, r), color)
+        self.fill_rect(x, y0 + 1, w, y1 - y0 - 1, color)
+
+    def _polygon_arrays(self, count):
+        """
+        Return the edge table, active edge and crossing arrays of fill_polygon,
+        growing them when a polygon has more than count edges.
+        """
+        arrays = self._polygon
+        if arrays is None or len(arrays[1]) < count:
+            arrays = (
+                array("i", bytes(count * 20)),
+                array("i", bytes(count * 4)),
+                array("i", bytes(count * 4)),
+            )
+            self._polygon = arrays
+
+        return arrays
+
+    @micropython.native
+    def fill_polygon(self, points, x, y, color, angle=0, center_x=0, center_y=0):
+        """
+        Draw a filled polygon using an edge table scanline fill, each row is
+        drawn as one span between each pair of edges crossing it. The edge
+        table is kept in arrays reused from call to call. A polygon with all
+        of its corners on one row is drawn as a line along that row.
+
+        Args:
+            points (list): flat list, tuple or array of the x and y
+                coordinates of the corners, the polygon is closed from the
+                last corner to the first
+            x (int): column to move the polygon to
+            y (int): row to move the polygon to
+            color (int): 565 encoded color
+            angle (float): angle in radians to rotate the polygon by around
+                center_x, center_y before it is moved, defaults to 0
+            center_x (int): column of the center of rotation, defaults to 0
+            center_y (int): row of the center of rotation, defaults to 0
+        """
+        count = len(points) // 2
+        if count < 3:
+            return
+
+        edges, active, crossings = self._polygon_arrays(count)
+        if angle:
+            cos_a = math.cos(angle)
+            sin_a = math.sin(angle)
+
+        # edge table of top row, bottom row, column at the top, columns and
+        # rows to the bottom, five entries per edge sorted by the top row.
+        # Horizontal edges are covered by the spans.
+        used = 0
+        x0 = y0 = left = right = bottom = 0
+        for i in range(count + 1):
+            j = i % count * 2
+            if angle:
+                px = points[j] - center_x
+                py = points[j + 1] - center_y
+                x1 = int(math.floor(px * cos_a - py * sin_a + center_x + x + 0.5))
+                y1 = int(math.floor(px * sin_a + py * cos_a + center_y + y + 0.5))
+            else:
+                x1 = points[j] + x
+                y1 = points[j + 1] + y
+
+            if i == 0:
+                left = right = x1
+                bottom = y1
+            else:
+                left = min(left, x1)
+                right = max(right, x1)
+                bottom = max(bottom, y1)
+                if y0 != y1:
+                    if y0 < y1:
+                        top, column, dx, dy = y0, x0, x1 - x0, y1 - y0
+                    else:
+                        top, column, dx, dy = y1, x1, x0 - x1, y0 - y1
+
+                    k = used * 5
+                    while k and edges[k - 5] > top:
+                        for m in range(k, k + 5):
+                            edges[m] = edges[m - 5]
+                        k -= 5
+
+                    edges[k] = top
+                    edges[k + 1] = top + dy
+                    edges[k + 2] = column
+                    edges[k + 3] = dx
+                    edges[k + 4] = dy
+                    used += 1
+
+            x0 = x1
+            y0 = y1
+
+        if not used:
+            self.fill_rect(left, y0, right - left + 1, 1, color)
+            return
+
+        clip = self._clip
+        row = max(edges[0], clip[1])
+        last = min(bottom, clip[3])
+        end = used * 5
+        index = 0
+        live = 0
+        while row <= last:
+            while index < end and edges[index] <= row:
+                active[live] = index
+                live += 1
+                index += 5
+
+            # edges are half open except at the bottom row of the polygon,
+            # crossings are rounded to the nearest column and kept sorted
+            found = 0
+            for i in range(live):
+                k = active[i]
+                if row < edges[k + 1] or row == edges[k + 1] == bottom:
+                    dy = edges[k + 4] * 2
+                    column = (
+                        (edges[k + 2] * 2 + 1) * edges[k + 4]
+                        + (row - edges[k]) * edges[k + 3] * 2
+                    ) // dy
+                    m = found
+                    while m and crossings[m - 1] > column:
+                        crossings[m] = crossings[m - 1]
+                        m -= 1
+
+                    crossings[m] = column
+                    found += 1
+
+            for i in range(0, found - 1, 2):
+                start = crossings[i]
+                self.fill_rect(start, row, crossings[i + 1] - start + 1, 1, color)
+
+            kept = 0
+            for i in range(live):
+                if edges[active[i] + 1] > row:
+                    active[kept] = active[i]
+                    kept += 1
+
+            live = kept
+            row += 1
+
+    def fill_triangle(self, x0, y0, x1, y1, x2, y2, color):
+        """
+        Draw a filled triangle.
+
+        Args:
+            x0 (int): first corner x coordinate
+            y0 (int): first corner y coordinate
+            x1 (int): second corner x coordinate
+            y1 (int): second corner y coordinate
+            x2 (int): third corner x coordinate
+            y2 (int): third corner y coordinate
+            color (int): 565 encoded color
+        """
+        self.fill_polygon((x0, y0, x1, y1, x2, y2), 0, 0, color)
+
+    def _aa_run(self, buffer, count, major, minor, steep):
+        """
+        Draw a run of anti-aliased pixels in one window, along a row or along
+        a column for steep lines.
+
+        Args:
+            buffer (buffer): big endian 565 encoded pixels of the run
+            count (int): number of pixels in the run
+            major (int): column of the first pixel, row for steep lines
+            minor (int): row of the run, column for steep lines
+            steep (bool): True if the run is along a column
+        """
+        if steep:
+            clip = self._clip_rect(minor, major, 1, count)
+        else:
+            clip = self._clip_rect(major, minor, count, 1)
+
+        if clip is not None:
+            x0, y0, x1, y1 = clip
+            start = ((y0 if steep else x0) - major) * 2
+            self._set_window(x0, y0, x1, y1)
+            self._write(None, buffer[start : start + (x1 - x0 + y1 - y0 + 1) * 2])
+
+    def aa_line(self, x0, y0, x1, y1, color, bg=BLACK):
+        """
+        Draw an anti-aliased line using Xiaolin Wu's algorithm. Each step
+        along the line covers the two pixels nearest to it, their coverage
+        selects colors from a cached table of colors blended from bg to
+        color. Pixels next to each other on the same row, or the same column
+        for steep lines, are sent in one window.
+
+        The display can not be read back, so the line is blended with bg and
+        should be drawn over a background of that color.
+
+        Args:
+            x0 (int): Start point x coordinate
+            y0 (int): Start point y coordinate
+            x1 (int): End point x coordinate
+            y1 (int): End point y coordinate
+            color (int): 565 encoded color
+            bg (int): 565 encoded background color, defaults to BLACK
+        """
+        steep = abs(y1 - y0) > abs(x1 - x0)
+        if steep:
+            x0, y0, x1, y1 = y0, x0, y1, x1
+        if x0 > x1:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+
+        gradient = (y1 - y0) / (x1 - x0) if x1 != x0 else 0
+        table = self._blend_table(color, bg, _AA_LEVELS)
+        top = _AA_LEVELS - 1
+        near = memoryview(bytearray((x1 - x0 + 1) * 2))
+        far = memoryview(bytearray((x1 - x0 + 1) * 2))
+        start = x0
+        row = y0
+        count = 0
+        covered = False
+        for x in range(x0, x1 + 1):
+            y = y0 + (x - x0) * gradient
+            minor = int(math.floor(y))
+            if minor != row:
+                self._aa_run(near, count, start, row, steep)
+                if covered:
+                    self._aa_run(far, count, start, row + 1, steep)
+                start = x
+                row = minor
+                count = 0
+                covered = False
+
+            level = int((y - minor) * top + 0.5)
+            i = count * 2
+            j = (top - level) * 2
+            near[i] = table[j]
+            near[i + 1] = table[j + 1]
+            far[i] = table[level * 2]
+            far[i + 1] = table[level * 2 + 1]
+            covered = covered or level > 0
+            count += 1
+
+        self._aa_run(near, count, start, row, steep)
+        if covered:
+            self._aa_run(far, count, start, row + 1, steep)
+
+    def aa_circle(self, x, y, r, color, bg=BLACK):
+        """
+        Draw an anti-aliased circle outline using Xiaolin Wu's algorithm.
+        One eighth of the circle is computed and each run of pixels on the
+        same row is sent in one window for each of the eight symmetric parts
+        of the circle.
+
+        The display can not be read back, so the circle is blended with bg
+        and should be drawn over a background of that color.
+
+        Args:
+            x (int): center column
+            y (int): center row
+            r (int): radius
+            color (int): 565 encoded color
+            bg (int): 565 encoded background color, defaults to BLACK
+        """
+        table = self._blend_table(color, bg, _AA_LEVELS)
+        top = _AA_LEVELS - 1
+        last = int(r * 0.7071067811865476)
+        start = 0
+        while start <= last:
+            # the run of steps from start with the same row as start
+            levels = []
+            row = -1
+            step = start
+            while step <= last:
+                exact = math.sqrt(r * r - step * step)
+                minor = int(exact)
+                if row >= 0 and minor != row:
+                    break
+                row = minor
+                levels.append(int((exact - minor) * top + 0.5))
+                step += 1
+
+            count = len(levels)
+            near = bytearray(count * 2)
+            far = bytearray(count * 2)
+            for i in range(count):
+                j = (top - levels[i]) * 2
+                near[i * 2] = table[j]
+                near[i * 2 + 1] = table[j + 1]
+                j = levels[i] * 2
+                far[i * 2] = table[j]
+                far[i * 2 + 1] = table[j + 1]
+
+            self._aa_octants(near, count, x, y, start, row)
+            if any(levels):
+                self._aa_octants(far, count, x, y, start, row + 1)
+
+            start += count
+
+    def _aa_octants(self, buffer, count, x, y, start, offset):
+        """
+        Draw a run of anti-aliased circle pixels in each of the eight
+        symmetric parts of a circle.
+
+        Args:
+            buffer (bytearray): big endian 565 encoded pixels of the run
+            count (int): number of pixels in the run
+            x (int): center column
+            y (int): center row
+            start (int): distance of the run from the axis it starts at
+            offset (int): distance of the run from the center along the
+                other axis
+        """
+        backward = bytearray(count * 2)
+        for i in range(0, count * 2, 2):
+            backward[i : i + 2] = buffer[count * 2 - 2 - i : count * 2 - i]
+
+        end = start + count - 1
+        for sign in (-1, 1):
+            self._aa_run(buffer, count, x + start, y + sign * offset, False)
+            self._aa_run(backward, count, x - end, y + sign * offset, False)
+            self._aa_run(buffer, count, y + start, x + sign * offset, True)
+            self._aa_run(backward, count, y - end, x + sign * offset, True)
+
     def vscrdef(self, tfa, vsa, bfa):
         """
         Set Vertical Scrolling Definition.
@@ -709,62 +1832,343 @@ class WT32SC01:
         """
         self._write(ST7796_VSCSAD, struct.pack(">H", vssa))
 
+    def scroll_axis(self):
+        """
+        Return the axis the hardware scrolls along in the current rotation
+        and the direction it scrolls in. The hardware always scrolls the rows
+        of the frame memory, these are columns in the landscape rotations.
+
+        Returns:
+            tuple: (axis, direction) where axis is 0 if the hardware scrolls
+            rows (y) and 1 if it scrolls columns (x), and direction is 1 if
+            the frame memory is in the same order as the axis or -1 if it is
+            reversed.
+        """
+        madctl = self._rotations[self._rotation]
+        axis = 1 if madctl & ST7796_MADCTL_MV else 0
+        return axis, -1 if madctl & ST7796_MADCTL_MY else 1
+
     @micropython.native
-    def text(self, font, text, x0, y0, color=WHITE, background=BLACK):
+    def text(self, font, text, x0, y0, color=WHITE, background=BLACK, scale=1):
         """
         Draw text on display in specified font and colors. 8 and 16 bit wide
-        fonts are supported.
+        fonts are supported. Characters are clipped to the clip rectangle.
+
+        Characters can be enlarged by an integer scale, each pixel of the font
+        is drawn as a scale by scale square.
 
         Args:
-            font (module): font module to use.
+            font (module): font module or BinaryFont to use.
             text (str): text to write
             x0 (int): column to start drawing at
             y0 (int): row to start drawing at
             color (int): 565 encoded color to use for characters
-            background (int): 565 encoded color to use for background
+            background (int): 565 encoded color to use for background or None
+                to only draw the foreground pixels of the characters
+            scale (int): integer scale of the characters, defaults to 1
         """
         wide = font.WIDTH // 8
         fg_hi = color >> 8
         fg_lo = color & 0xFF
-        bg_hi = background >> 8
-        bg_lo = background & 0xFF
+        bg_hi = 0 if background is None else background >> 8
+        bg_lo = 0 if background is None else background & 0xFF
+
+        if (
+            scale == 1
+            and background is not None
+            and self._text_run(font, text, x0, y0, color, background)
+        ):
+            return
+
+        fetch = getattr(font, "glyph", None)
+        glyph_bits = font.HEIGHT * font.WIDTH
+        width = font.WIDTH * scale
+        height = font.HEIGHT * scale
+
+        if scale > 1 and background is not None:
+            table = self._scale_table(color, background, scale)
+            buffer = memoryview(bytearray(width * 2))
+        else:
+            buffer = memoryview(bytearray(font.WIDTH * font.HEIGHT * 2))
 
-        buffer = bytearray(font.WIDTH * font.HEIGHT * 2)
         for char in text:
             ch = ord(char)
-            if (
-                font.FIRST <= ch < font.LAST
-                and x0 + font.WIDTH <= self.width
-                and y0 + font.HEIGHT <= self.height
-            ):
-                buf_idx = 0
-                chr_idx = (ch - font.FIRST) * (font.HEIGHT * wide)
-                for _ in range(font.HEIGHT):
-                    for _ in range(wide):
-                        chr_data = font.FONT[chr_idx]
-                        for _ in range(8):
-                            if chr_data & 0x80:
-                                buffer[buf_idx] = fg_hi
-                                buffer[buf_idx + 1] = fg_lo
-                            else:
-                                buffer[buf_idx] = bg_hi
-                                buffer[buf_idx + 1] = bg_lo
-                            buf_idx += 2
-                            chr_data <<= 1
-                        chr_idx += 1
-
-                to_col = x0 + font.WIDTH - 1
-                to_row = y0 + font.HEIGHT - 1
-                if self.width > to_col and self.height > to_row:
-                    self._set_window(x0, y0, to_col, to_row)
-                    self._write(None, buffer)
-
-                x0 += font.WIDTH
+            if font.FIRST <= ch < font.LAST:
+                clip = self._clip_rect(x0, y0, width, height)
+                if clip is not None:
+                    bit = (ch - font.FIRST) * glyph_bits
+                    if fetch is None:
+                        data = font.FONT
+                    else:
+                        data, bit = fetch(bit, glyph_bits)
+
+                if clip is not None and background is None:
+                    runs = self._glyph_runs(
+                        (font, ch), data, bit, font.WIDTH, font.HEIGHT
+                    )
+                    self._draw_runs(runs, x0, y0, color, scale)
+                elif clip is not None and scale > 1:
+                    self._text_scaled(
+                        data, bit // 8, wide, table, buffer, x0, y0, scale, clip
+                    )
+                elif clip is not None:
+                    x1, y1, x2, y2 = clip
+                    rows = y2 - y1 + 1
+                    buf_idx = 0
+                    chr_idx = bit // 8 + (y1 - y0) * wide
+                    for _ in range(rows):
+                        for _ in range(wide):
+                            chr_data = data[chr_idx]
+                            for _ in range(8):
+                                if chr_data & 0x80:
+                                    buffer[buf_idx] = fg_hi
+                                    buffer[buf_idx + 1] = fg_lo
+                                else:
+                                    buffer[buf_idx] = bg_hi
+                                    buffer[buf_idx + 1] = bg_lo
+                                buf_idx += 2
+                                chr_data <<= 1
+                            chr_idx += 1
+
+                    self._set_window(x1, y1, x2, y2)
+                    self._write_rows(buffer, 0, font.WIDTH, x1 - x0, x2 - x1 + 1, rows)
+
+                x0 += width
+
+    @micropython.native
+    def _text_run(self, font, text, x, y, color, background):
+        """
+        Draw a string that is not clipped in one window, building each row
+        of the string through the nibble table of _scale_table. Returns False
+        without drawing if the string is clipped.
+        """
+        wide = font.WIDTH // 8
+        glyph_bits = font.HEIGHT * font.WIDTH
+        fetch = getattr(font, "glyph", None)
+        glyphs = []
+        for char in text:
+            ch = ord(char)
+            if font.FIRST <= ch < font.LAST:
+                glyphs.append(ch)
+
+        width = len(glyphs) * font.WIDTH
+        if width == 0:
+            return True
+
+        x1 = x + width - 1
+        y1 = y + font.HEIGHT - 1
+        if self._clip_rect(x, y, width, font.HEIGHT) != (x, y, x1, y1):
+            return False
+
+        for i in range(len(glyphs)):
+            bit = (glyphs[i] - font.FIRST) * glyph_bits
+            if fetch is None:
+                glyphs[i] = (font.FONT, bit // 8)
+            else:
+                data, bit = fetch(bit, glyph_bits)
+                glyphs[i] = (data, bit // 8)
+
+        table = self._scale_table(color, background, 1)
+        buffer = memoryview(bytearray(width * 2))
+        self._set_window(x, y, x1, y1)
+        for row in range(0, font.HEIGHT * wide, wide):
+            pos = 0
+            for data, index in glyphs:
+                for i in range(index + row, index + row + wide):
+                    value = (data[i] >> 4) * 8
+                    buffer[pos : pos + 8] = table[value : value + 8]
+                    value = (data[i] & 0x0F) * 8
+                    buffer[pos + 8 : pos + 16] = table[value : value + 8]
+                    pos += 16
+
+            self._write(None, buffer)
+
+        return True
+
+    @micropython.native
+    def _text_scaled(self, data, index, wide, table, buffer, x, y, scale, clip):
+        """
+        Draw the visible part of a scaled rom font glyph in one window. Each
+        row of the glyph is expanded into the row buffer through the nibble
+        table once and then sent scale times.
+
+        Args:
+            data (buffer): font data holding the glyph
+            index (int): index of the first byte of the glyph in data
+            wide (int): bytes per glyph row
+            table (memoryview): nibble table from _scale_table
+            buffer (memoryview): row buffer, two bytes per scaled pixel
+            x (int): column of the glyph
+            y (int): row of the glyph
+            scale (int): integer scale of the glyph
+            clip (tuple): visible part of the glyph from _clip_rect
+        """
+        x0, y0, x1, y1 = clip
+        nibble = scale * 8
+        start = (x0 - x) * 2
+        end = (x1 - x + 1) * 2
+        row = (y0 - y) // scale
+        repeat = scale - (y0 - y) % scale
+        left = y1 - y0 + 1
+
+        self._set_window(x0, y0, x1, y1)
+        while left > 0:
+            pos = 0
+            for i in range(index + row * wide, index + row * wide + wide):
+                value = (data[i] >> 4) * nibble
+                buffer[pos : pos + nibble] = table[value : value + nibble]
+                pos += nibble
+                value = (data[i] & 0x0F) * nibble
+                buffer[pos : pos + nibble] = table[value : value + nibble]
+                pos += nibble
+
+            for _ in range(min(repeat, left)):
+                self._write(None, buffer[start:end])
+
+            left -= repeat
+            row += 1
+            repeat = scale
+
+    def _scale_table(self, fg, bg, scale):
+        """
+        Return a table of the big endian 565 encoded pixels of each 4 bit
+        nibble of a rom font row with every bit repeated scale times. Tables
+        are cached per (fg, bg, scale).
+
+        Args:
+            fg (int): 565 encoded foreground color
+            bg (int): 565 encoded background color
+            scale (int): integer scale
+        """
+        key = (fg, bg, scale)
+        table = self._scale_tables.get(key)
+        if table is not None:
+            return table
+
+        nibble = scale * 8
+        table = bytearray(16 * nibble)
+        for value in range(16):
+            for pixel in range(4 * scale):
+                color = fg if value & (8 >> pixel // scale) else bg
+                pos = value * nibble + pixel * 2
+                table[pos] = color >> 8
+                table[pos + 1] = color & 0xFF
+
+        if len(self._scale_tables) >= _BLEND_CACHE_SIZE:
+            self._scale_tables.clear()
+
+        table = memoryview(table)
+        self._scale_tables[key] = table
+        return table
+
+    @micropython.native
+    def _glyph_runs(self, key, data, bs_bit, width, height, bpp=1):
+        """
+        Return the horizontal runs of foreground pixels of a glyph as a flat
+        array of (column, row, length) values. Runs are cached per glyph.
+        Pixels of anti-aliased glyphs are foreground pixels when they are at
+        least half covered.
+
+        Args:
+            key (tuple): cache key of the glyph
+            data (buffer): glyph bitmap data
+            bs_bit (int): bit offset of the glyph in data
+            width (int): width of the glyph in pixels
+            height (int): height of the glyph in pixels
+            bpp (int): bits per pixel of the glyph data
+        """
+        runs = self._runs.get(key)
+        if runs is not None:
+            return runs
+
+        mask = (1 << bpp) - 1
+        threshold = 1 << (bpp - 1)
+        runs = array("H")
+        for row in range(height):
+            start = -1
+            for col in range(width):
+                level = data[bs_bit // 8] >> (8 - bpp - bs_bit % 8) & mask
+                bs_bit += bpp
+                if level >= threshold:
+                    if start < 0:
+                        start = col
+                elif start >= 0:
+                    runs.append(start)
+                    runs.append(row)
+                    runs.append(col - start)
+                    start = -1
+
+            if start >= 0:
+                runs.append(start)
+                runs.append(row)
+                runs.append(width - start)
+
+        if len(self._runs) >= _RUN_CACHE_SIZE:
+            self._runs.clear()
+
+        self._runs[key] = runs
+        return runs
+
+    def _blend_table(self, fg, bg, levels):
+        """
+        Return a table of the big endian 565 encoded colors for each coverage
+        level from bg to fg. Tables are cached per (fg, bg, levels).
+
+        Args:
+            fg (int): 565 encoded foreground color
+            bg (int): 565 encoded background color
+            levels (int): number of coverage levels
+        """
+        key = (fg, bg, levels)
+        table = self._blend_tables.get(key)
+        if table is not None:
+            return table
+
+        top = levels - 1
+        table = bytearray(levels * 2)
+        for level in range(levels):
+            rest = top - level
+            red = ((bg >> 11) * rest + (fg >> 11) * level + top // 2) // top
+            green = (
+                (bg >> 5 & 0x3F) * rest + (fg >> 5 & 0x3F) * level + top // 2
+            ) // top
+            blue = ((bg & 0x1F) * rest + (fg & 0x1F) * level + top // 2) // top
+            color = red << 11 | green << 5 | blue
+            table[level * 2] = color >> 8
+            table[level * 2 + 1] = color & 0xFF
+
+        if len(self._blend_tables) >= _BLEND_CACHE_SIZE:
+            self._blend_tables.clear()
+
+        self._blend_tables[key] = table
+        return table
+
+    @micropython.native
+    def _draw_runs(self, runs, x, y, color, scale=1):
+        """
+        Draw the runs returned by _glyph_runs at the given location.
+
+        Args:
+            runs (array): flat array of (column, row, length) values
+            x (int): column of the glyph
+            y (int): row of the glyph
+            color (int): 565 encoded color
+            scale (int): integer scale of the glyph, defaults to 1
+        """
+        for i in range(0, len(runs), 3):
+            self.fill_rect(
+                x + runs[i] * scale,
+                y + runs[i + 1] * scale,
+                runs[i + 2] * scale,
+                scale,
+                color,
+            )
 
     @micropython.native
     def bitmap(self, bitmap, x, y, index=0):
         """
-        Draw a bitmap on display at the specified column and row
+        Draw a bitmap on display at the specified column and row. The bitmap
+        is clipped to the clip rectangle.
 
         Args:
             bitmap (bitmap_module): The module containing the bitmap to draw
@@ -773,104 +2177,568 @@ class WT32SC01:
             index (int): Optional index of bitmap to draw from multiple bitmap
                 module
 
+        Bitmaps converted using the --raw565 option have a BPP of 16 and are
+        sent to the display without decoding. Bitmaps converted using the
+        --rle option are decoded into runs of pixels, runs of a single color
+        are sent as one burst. Pixels of bitmaps converted using the
+        --transparent option that use the TRANSPARENT palette index are not
+        drawn.
         """
-        bitmap_size = bitmap.HEIGHT * bitmap.WIDTH
-        buffer_len = bitmap_size * 2
-        buffer = bytearray(buffer_len)
-        bs_bit = bitmap.BPP * bitmap_size * index if index > 0 else 0
+        width = bitmap.WIDTH
+        height = bitmap.HEIGHT
+        clip = self._clip_rect(x, y, width, height)
+        if clip is None:
+            return
+
+        x0, y0, x1, y1 = clip
+        row = y0 - y
+        rows = y1 - y0 + 1
+        col = x0 - x
+        cols = x1 - x0 + 1
+        bitmap_size = width * height
+
+        if bitmap.BPP == 16:
+            self._set_window(x0, y0, x1, y1)
+            self._write_rows(
+                bitmap.BITMAP[bitmap_size * 2 * index :], row, width, col, cols, rows
+            )
+            return
+
+        transparent = getattr(bitmap, "TRANSPARENT", None)
+        if transparent is not None:
+            self._bitmap_spans(
+                bitmap, self._bitmap_indexes(bitmap, index), x, y, transparent, clip
+            )
+            return
+
+        indexes = None
+        if getattr(bitmap, "RLE", False):
+            if rows == height and cols == width:
+                self._set_window(x0, y0, x1, y1)
+                self._bitmap_rle(bitmap, index)
+                return
+
+            indexes = self._bitmap_indexes(bitmap, index)
+
+        buffer_len = width * rows * 2
+        buffer = memoryview(bytearray(buffer_len))
+        palette = bitmap.PALETTE
+        pos = row * width
+        if indexes is None:
+            data = bitmap.BITMAP
+            bpp = bitmap.BPP
+            bs_bit = bpp * (bitmap_size * index + pos)
+            for i in range(0, buffer_len, 2):
+                color_index = 0
+                for _ in range(bpp):
+                    color_index <<= 1
+                    color_index |= (data[bs_bit // 8] & 1 << (7 - (bs_bit % 8))) > 0
+                    bs_bit += 1
 
-        for i in range(0, buffer_len, 2):
+                color = palette[color_index]
+                buffer[i + 1] = (color & 0xFF00) >> 8
+                buffer[i] = color & 0xFF
+        else:
+            for i in range(0, buffer_len, 2):
+                color = palette[indexes[pos]]
+                buffer[i + 1] = (color & 0xFF00) >> 8
+                buffer[i] = color & 0xFF
+                pos += 1
+
+        self._set_window(x0, y0, x1, y1)
+        self._write_rows(buffer, 0, width, col, cols, rows)
+
+    @micropython.native
+    def _bitmap_indexes(self, bitmap, index):
+        """
+        Decode a bitmap into a bytearray holding the palette index of each
+        pixel.
+
+        Args:
+            bitmap (bitmap_module): The module containing the bitmap
+            index (int): index of the bitmap to decode
+        """
+        data = bitmap.BITMAP
+        bitmap_size = bitmap.HEIGHT * bitmap.WIDTH
+        indexes = bytearray(bitmap_size)
+        if getattr(bitmap, "RLE", False):
+            i = bitmap.OFFSETS[index]
+            end = bitmap.OFFSETS[index + 1]
+            pos = 0
+            while i < end:
+                header = data[i]
+                i += 1
+                if header > 128:
+                    count = 257 - header
+                    indexes[pos : pos + count] = bytes((data[i],)) * count
+                    pos += count
+                    i += 1
+                elif header < 128:
+                    count = header + 1
+                    indexes[pos : pos + count] = data[i : i + count]
+                    pos += count
+                    i += count
+            return indexes
+
+        bpp = bitmap.BPP
+        bs_bit = bpp * bitmap_size * index
+        for pos in range(bitmap_size):
             color_index = 0
-            for _ in range(bitmap.BPP):
+            for _ in range(bpp):
                 color_index <<= 1
-                color_index |= (
-                    bitmap.BITMAP[bs_bit // 8] & 1 << (7 - (bs_bit % 8))
-                ) > 0
+                color_index |= (data[bs_bit // 8] & 1 << (7 - (bs_bit % 8))) > 0
                 bs_bit += 1
+            indexes[pos] = color_index
 
-            color = bitmap.PALETTE[color_index]
-            buffer[i + 1] = (color & 0xFF00) >> 8
-            buffer[i] = color & 0xFF
+        return indexes
 
-        to_col = x + bitmap.WIDTH - 1
-        to_row = y + bitmap.HEIGHT - 1
-        if self.width > to_col and self.height > to_row:
-            self._set_window(x, y, to_col, to_row)
-            self._write(None, buffer)
+    @micropython.native
+    def _bitmap_spans(self, bitmap, indexes, x, y, transparent, clip):
+        """
+        Draw the visible opaque spans of each row of a decoded bitmap,
+        skipping the pixels that use the transparent palette index.
+
+        Args:
+            bitmap (bitmap_module): The module containing the bitmap
+            indexes (bytearray): palette index of each pixel of the bitmap
+            x (int): column to start drawing at
+            y (int): row to start drawing at
+            transparent (int): palette index of transparent pixels
+            clip (tuple): visible part of the bitmap (x0, y0, x1, y1)
+        """
+        x0, y0, x1, y1 = clip
+        palette = bitmap.PALETTE
+        width = bitmap.WIDTH
+        buffer = memoryview(bytearray((x1 - x0 + 1) * 2))
+        for row in range(y0 - y, y1 - y + 1):
+            row_start = row * width
+            pos = row_start + x0 - x
+            end = row_start + x1 - x + 1
+            while pos < end:
+                if indexes[pos] == transparent:
+                    pos += 1
+                    continue
+
+                start = pos
+                buf_idx = 0
+                while pos < end and indexes[pos] != transparent:
+                    color = palette[indexes[pos]]
+                    buffer[buf_idx] = color & 0xFF
+                    buffer[buf_idx + 1] = color >> 8
+                    buf_idx += 2
+                    pos += 1
+
+                col = x + start - row_start
+                self._set_window(col, y + row, col + pos - start - 1, y + row)
+                self._write(None, buffer[:buf_idx])
+
+    @micropython.native
+    def _bitmap_rle(self, bitmap, index):
+        """
+        Decode a PackBits run length encoded bitmap into the current window,
+        joining runs of the same color into a single burst.
+
+        Args:
+            bitmap (bitmap_module): The module containing the bitmap to draw
+            index (int): index of the bitmap to draw
+        """
+        data = bitmap.BITMAP
+        palette = bitmap.PALETTE
+        buffer = bytearray(256)
+        run_color = 0
+        run_count = 0
+        i = bitmap.OFFSETS[index]
+        end = bitmap.OFFSETS[index + 1]
+        while i < end:
+            header = data[i]
+            i += 1
+            if header > 128:
+                color = palette[data[i]]
+                color = (color & 0xFF) << 8 | color >> 8
+                i += 1
+                if run_count and color != run_color:
+                    self._write_run(run_color, run_count)
+                    run_count = 0
+                run_color = color
+                run_count += 257 - header
+            elif header < 128:
+                if run_count:
+                    self._write_run(run_color, run_count)
+                    run_count = 0
+                count = header + 1
+                buf_idx = 0
+                for _ in range(count):
+                    color = palette[data[i]]
+                    buffer[buf_idx] = color & 0xFF
+                    buffer[buf_idx + 1] = color >> 8
+                    buf_idx += 2
+                    i += 1
+                self._write(None, buffer[:buf_idx])
+
+        if run_count:
+            self._write_run(run_color, run_count)
 
     @micropython.native
     def write(self, font, string, x, y, fg=WHITE, bg=BLACK):
         """
         Write a string using a converted true-type font on the display starting
-        at the specified column and row
+        at the specified column and row. Characters are clipped to the clip
+        rectangle.
+
+        Fonts converted with the --bounding-boxes option only store the pixels
+        inside the bounding box of each glyph. The background around the boxes
+        is filled using as few rectangles as possible, or skipped when bg is
+        None.
+
+        Fonts converted with 2 or 4 bits per pixel are anti-aliased, the
+        coverage of each pixel selects a color blended from bg to fg. When bg
+        is None pixels that are at least half covered are drawn in fg.
+
+        Fonts converted with the --kerning option move each character by the
+        kerning adjustment of the pair it forms with the previous character.
+        Character cells are drawn left to right, so with a background color
+        a negatively kerned cell paints over the edge of the previous cell.
 
         Args:
-            font (font): The module containing the converted true-type font
+            font (font): The module, BinaryFont or FontChain containing the
+                converted true-type font
             s (string): The string to write
             x (int): column to start writing
             y (int): row to start writing
             fg (int): foreground color, optional, defaults to WHITE
-            bg (int): background color, optional, defaults to BLACK
+            bg (int): background color, optional, defaults to BLACK, None to
+                only draw the foreground pixels of the characters
         """
-        buffer_len = font.HEIGHT * font.MAX_WIDTH * 2
-        buffer = bytearray(buffer_len)
-        fg_hi = (fg & 0xFF00) >> 8
-        fg_lo = fg & 0xFF
-
-        bg_hi = (bg & 0xFF00) >> 8
-        bg_lo = bg & 0xFF
+        buffer = memoryview(bytearray(font.HEIGHT * font.MAX_WIDTH * 2))
+        chain = getattr(font, "resolve", None)
+        pending = [None, None, None]
+        glyph_font = None
+        dy = 0
+        previous = -1
 
         for character in string:
             try:
-                char_index = font.MAP.index(character)
-                offset = char_index * font.OFFSET_WIDTH
-                bs_bit = font.OFFSETS[offset]
-                if font.OFFSET_WIDTH > 1:
-                    bs_bit = (bs_bit << 8) + font.OFFSETS[offset + 1]
-
-                if font.OFFSET_WIDTH > 2:
-                    bs_bit = (bs_bit << 8) + font.OFFSETS[offset + 2]
-
-                char_width = font.WIDTHS[char_index]
-                buffer_needed = char_width * font.HEIGHT * 2
-
-                for i in range(0, buffer_needed, 2):
-                    if font.BITMAPS[bs_bit // 8] & 1 << (7 - (bs_bit % 8)) > 0:
-                        buffer[i] = fg_hi
-                        buffer[i + 1] = fg_lo
+                if chain is None:
+                    current = font
+                    char_index = font.MAP.index(character)
+                else:
+                    current, char_index, dy = chain(character)
+
+                if current is not glyph_font:
+                    glyph_font = current
+                    bpp = glyph_font.BPP
+                    mask = (1 << bpp) - 1
+                    table = self._blend_table(fg, BLACK if bg is None else bg, 1 << bpp)
+                    offset_width = glyph_font.OFFSET_WIDTH
+                    bboxes = getattr(glyph_font, "BBOXES", None)
+                    kerning = getattr(glyph_font, "KERNING", None)
+                    fetch = getattr(glyph_font, "glyph", None)
+                    previous = -1
+
+                if kerning is not None:
+                    if previous >= 0:
+                        x += self._kerning(
+                            kerning, glyph_font.KERNING_WIDTH, previous, char_index
+                        )
+                    previous = char_index
+
+                offset = char_index * offset_width
+                bs_bit = glyph_font.OFFSETS[offset]
+                if offset_width > 1:
+                    bs_bit = (bs_bit << 8) + glyph_font.OFFSETS[offset + 1]
+
+                if offset_width > 2:
+                    bs_bit = (bs_bit << 8) + glyph_font.OFFSETS[offset + 2]
+
+                char_width = glyph_font.WIDTHS[char_index]
+                if bboxes is None:
+                    box_x = 0
+                    box_y = dy
+                    box_width = char_width
+                    box_height = glyph_font.HEIGHT
+                else:
+                    box = char_index * 4
+                    box_x = bboxes[box]
+                    box_y = bboxes[box + 1] + dy
+                    box_width = bboxes[box + 2]
+                    box_height = bboxes[box + 3]
+
+                if bg is not None and (bboxes is not None or chain is not None):
+                    self._fill_margins(
+                        pending,
+                        x,
+                        y,
+                        char_width,
+                        font.HEIGHT,
+                        box_x,
+                        box_y,
+                        box_width,
+                        box_height,
+                        bg,
+                    )
+
+                glyph_x = x + box_x
+                glyph_y = y + box_y
+                clip = self._clip_rect(glyph_x, glyph_y, box_width, box_height)
+                if clip is not None:
+                    if fetch is None:
+                        data = glyph_font.BITMAPS
                     else:
-                        buffer[i] = bg_hi
-                        buffer[i + 1] = bg_lo
-
-                    bs_bit += 1
-
-                to_col = x + char_width - 1
-                to_row = y + font.HEIGHT - 1
-                if self.width > to_col and self.height > to_row:
-                    self._set_window(x, y, to_col, to_row)
-                    self._write(None, buffer[:buffer_needed])
+                        data, bs_bit = fetch(bs_bit, box_width * box_height * bpp)
+
+                if clip is not None and bg is None:
+                    runs = self._glyph_runs(
+                        (glyph_font, char_index),
+                        data,
+                        bs_bit,
+                        box_width,
+                        box_height,
+                        bpp,
+                    )
+                    self._draw_runs(runs, glyph_x, glyph_y, fg)
+                elif clip is not None:
+                    x0, y0, x1, y1 = clip
+                    rows = y1 - y0 + 1
+                    bs_bit += (y0 - glyph_y) * box_width * bpp
+                    for i in range(0, box_width * rows * 2, 2):
+                        level = data[bs_bit // 8] >> (8 - bpp - bs_bit % 8)
+                        level = (level & mask) * 2
+                        buffer[i] = table[level]
+                        buffer[i + 1] = table[level + 1]
+                        bs_bit += bpp
+
+                    self._set_window(x0, y0, x1, y1)
+                    self._write_rows(
+                        buffer, 0, box_width, x0 - glyph_x, x1 - x0 + 1, rows
+                    )
 
                 x += char_width
 
             except ValueError:
-                pass
+                previous = -1
+
+        for rect in pending:
+            if rect is not None:
+                self.fill_rect(rect[0], rect[1], rect[2], rect[3], bg)
 
-    def write_width(self, font, string):
+    def _fill_margins(
+        self, pending, x, y, width, height, box_x, box_y, box_width, box_height, color
+    ):
+        """
+        Fill the background around the bounding box of a glyph. The margins
+        above, below and beside the box are kept pending so they can be joined
+        with the matching margins of the next glyph.
+
+        Args:
+            pending (list): pending top, side and bottom rectangles
+            x (int): column of the glyph cell
+            y (int): row of the glyph cell
+            width (int): width of the glyph cell
+            height (int): height of the glyph cell
+            box_x (int): column of the bounding box in the cell
+            box_y (int): row of the bounding box in the cell
+            box_width (int): width of the bounding box
+            box_height (int): height of the bounding box
+            color (int): 565 encoded background color
+        """
+        if box_width == 0 or box_height == 0:
+            self._fill_pending(pending, 1, x, y, width, height, color)
+            return
+
+        bottom = box_y + box_height
+        right = box_x + box_width
+        self._fill_pending(pending, 0, x, y, width, box_y, color)
+        self._fill_pending(pending, 1, x, y + box_y, box_x, box_height, color)
+        self._fill_pending(
+            pending, 1, x + right, y + box_y, width - right, box_height, color
+        )
+        self._fill_pending(pending, 2, x, y + bottom, width, height - bottom, color)
+
+    def _fill_pending(self, pending, slot, x, y, width, height, color):
+        """
+        Add a rectangle to a pending slot, extending the pending rectangle if
+        the new one continues it to the right, otherwise filling the pending
+        rectangle and replacing it.
+        """
+        if width <= 0 or height <= 0:
+            return
+
+        rect = pending[slot]
+        if rect is not None:
+            if rect[1] == y and rect[3] == height and rect[0] + rect[2] == x:
+                rect[2] += width
+                return
+
+            self.fill_rect(rect[0], rect[1], rect[2], rect[3], color)
+
+        pending[slot] = [x, y, width, height]
+
+    def write_width(self, font, string, positions=None):
         """
         Returns the width in pixels of the string if it was written with the
         specified font
 
         Args:
-            font (font): The module containing the converted true-type font
+            font (font): The module, BinaryFont or FontChain containing the font
             string (string): The string to measure
+            positions (list): optional list to append the offset and width of
+                each character of the string to, the width of characters not
+                in the font is 0
         """
         width = 0
+        chain = getattr(font, "resolve", None)
+        glyph_font = None
+        previous = -1
         for character in string:
             try:
-                char_index = font.MAP.index(character)
-                width += font.WIDTHS[char_index]
+                if chain is None:
+                    current = font
+                    char_index = font.MAP.index(character)
+                else:
+                    current, char_index, _ = chain(character)
+
+                if current is not glyph_font:
+                    glyph_font = current
+                    kerning = getattr(glyph_font, "KERNING", None)
+                    previous = -1
+
+                if kerning is not None:
+                    if previous >= 0:
+                        width += self._kerning(
+                            kerning, glyph_font.KERNING_WIDTH, previous, char_index
+                        )
+                    previous = char_index
+
+                if positions is not None:
+                    positions.append(width)
+                    positions.append(glyph_font.WIDTHS[char_index])
+
+                width += glyph_font.WIDTHS[char_index]
 
             except ValueError:
-                pass
+                previous = -1
+                if positions is not None:
+                    positions.append(width)
+                    positions.append(0)
 
         return width
+
+    def render_text(self, font, string, fg=WHITE, bg=BLACK):
+        """
+        Render a string into a TextImage. Drawing the image with the bitmap
+        method sends the pixels in one window without decoding the glyphs
+        again, see TextImagePool to cache the images of frequently drawn
+        strings.
+
+        Args:
+            font (font): rom font module, converted true-type font module,
+                BinaryFont or FontChain
+            string (string): The string to render
+            fg (int): foreground color, optional, defaults to WHITE
+            bg (int): background color, optional, defaults to BLACK
+
+        Returns:
+            TextImage: the rendered string
+        """
+        if hasattr(font, "FIRST"):
+            width = 0
+            for char in string:
+                if font.FIRST <= ord(char) < font.LAST:
+                    width += font.WIDTH
+        else:
+            width = self.write_width(font, string)
+
+        canvas = _Canvas(self, width, font.HEIGHT)
+        canvas.fill_rect(0, 0, width, font.HEIGHT, bg)
+        if hasattr(font, "FIRST"):
+            canvas.text(font, string, 0, 0, fg, bg)
+        else:
+            canvas.write(font, string, 0, 0, fg, bg)
+
+        return TextImage(width, font.HEIGHT, canvas.buffer)
+
+    @micropython.native
+    def _kerning(self, kerning, index_width, left, right):
+        """
+        Return the kerning adjustment in pixels for a pair of MAP indexes by
+        binary searching the sorted pair table of a converted true-type font.
+
+        Args:
+            kerning (memoryview): KERNING table of the font
+            index_width (int): bytes per MAP index in the table
+            left (int): MAP index of the first character of the pair
+            right (int): MAP index of the second character of the pair
+        """
+        step = index_width * 2 + 1
+        key = left << (index_width * 8) | right
+        low = 0
+        high = len(kerning) // step
+        while low < high:
+            middle = (low + high) >> 1
+            i = middle * step
+            pair = 0
+            for j in range(i, i + step - 1):
+                pair = pair << 8 | kerning[j]
+
+            if pair < key:
+                low = middle + 1
+            elif pair > key:
+                high = middle
+            else:
+                adjustment = kerning[i + step - 1]
+                return adjustment - 256 if adjustment > 127 else adjustment
+
+        return 0
+
+
+class _Canvas(WT32SC01):
+    """
+    Draws into a buffer of big endian 565 encoded pixels instead of the
+    display, the drawing methods of the driver run unchanged and the windows
+    they write are copied into the buffer. The glyph and color caches are
+    shared with the display.
+
+    Args:
+        tft (WT32SC01): display driver to share the caches of
+        width (int): width of the buffer
+        height (int): height of the buffer
+    """
+
+    def __init__(self, tft, width, height):
+        self._init_state()
+        self.width = width
+        self.height = height
+        self.buffer = bytearray(width * height * 2)
+        self._runs = tft._runs
+        self._blend_tables = tft._blend_tables
+        self._scale_tables = tft._scale_tables
+        self._widths = tft._widths
+        self._clip = (0, 0, width - 1, height - 1)
+        self._window = (0, 0, 0, 0)
+        self._col = 0
+        self._row = 0
+
+    def _set_window(self, x0, y0, x1, y1):
+        self._window = (x0, y0, x1, y1)
+        self._col = x0
+        self._row = y0
+
+    def _write(self, command=None, data=None):
+        if data is None:
+            return
+
+        x0, _, x1, _ = self._window
+        buffer = self.buffer
+        pos = 0
+        while pos < len(data):
+            count = min(len(data) - pos, (x1 - self._col + 1) * 2)
+            start = (self._row * self.width + self._col) * 2
+            buffer[start : start + count] = data[pos : pos + count]
+            pos += count
+            self._col += count // 2
+            if self._col > x1:
+                self._col = x0
+                self._row += 1
+
+    def _write_run(self, color, count):
+        self._write(None, _encode_pixel(color) * count)
@@ -21,6 +21,7 @@ autodoc_mock_imports = [
     'micropython',
     'ustruct',
     'machine',
+    'esp32',
     'board',
     'network',
     'esp',
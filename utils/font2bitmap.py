@@ -43,6 +43,7 @@ import sys
 import shlex
 import argparse
 import bisect
+import struct
 import freetype
 
 
@@ -89,7 +90,8 @@ class Bitmap(object):
     """
     A 2D bitmap image represented as a list of byte values. Each byte indicates
     the state of a single pixel in the bitmap. A value of 0 indicates that the
-    pixel is `off` and any other value indicates that it is `on`.
+    pixel is `off` and any other value indicates that it is `on`. Grayscale
+    bitmaps hold the coverage of each pixel from 0 to 255.
     """
     def __init__(self, width, height, pixels=None):
         self.width = int(width)
@@ -105,14 +107,39 @@ class Bitmap(object):
             rows += '\n'
         return rows
 
-    def bit_string(self):
-        """Return a binary string representation of the bitmap's pixels."""
+    def bit_string(self, x=0, y=0, width=None, height=None, bpp=1):
+        """
+        Return a binary string representation of the bitmap's pixels, or of
+        the pixels inside the given box. With a bpp greater than 1 the
+        grayscale coverage of each pixel is scaled to bpp bits.
+        """
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        levels = (1 << bpp) - 1
         bits = ''
-        for y in range(self.height):
-            for x in range(self.width):
-                bits += '1' if self.pixels[y * self.width + x] else '0'
+        for row in range(y, y + height):
+            for col in range(x, x + width):
+                pixel = self.pixels[row * self.width + col]
+                if bpp == 1:
+                    bits += '1' if pixel else '0'
+                else:
+                    level = (pixel * levels + 127) // 255
+                    bits += format(level, f'0{bpp}b')
         return bits
 
+    def bounding_box(self):
+        """
+        Return the (x, y, width, height) of the smallest box holding all of
+        the `on` pixels, or (0, 0, 0, 0) if no pixels are `on`.
+        """
+        cols = [i % self.width for i, pixel in enumerate(self.pixels) if pixel]
+        if not cols:
+            return (0, 0, 0, 0)
+
+        rows = [i // self.width for i, pixel in enumerate(self.pixels) if pixel]
+        x, y = min(cols), min(rows)
+        return (x, y, max(cols) - x + 1, max(rows) - y + 1)
+
     def bitblt(self, src, x, y):
         """Copy all pixels from `src` into this bitmap"""
         srcpixel = 0
@@ -121,12 +148,12 @@ class Bitmap(object):
 
         for _ in range(src.height):
             for _ in range(src.width):
-                # Perform an OR operation on the destination pixel and the
-                # source pixel because glyph bitmaps may overlap if character
+                # Keep the larger of the destination pixel and the source
+                # pixel because glyph bitmaps may overlap if character
                 # kerning is applied, e.g. in the string "AVA", the "A" and "V"
                 # glyphs must be rendered with overlapping bounding boxes.
-                self.pixels[dstpixel] = (
-                    self.pixels[dstpixel] or src.pixels[srcpixel])
+                self.pixels[dstpixel] = max(
+                    self.pixels[dstpixel], src.pixels[srcpixel])
                 srcpixel += 1
                 dstpixel += 1
             dstpixel += row_offset
@@ -159,9 +186,12 @@ class Glyph(object):
         return self.bitmap.height
 
     @staticmethod
-    def from_glyphslot(slot):
+    def from_glyphslot(slot, grayscale=False):
         """Construct and return a Glyph object from a FreeType GlyphSlot."""
-        pixels = Glyph.unpack_mono_bitmap(slot.bitmap)
+        if grayscale:
+            pixels = Glyph.unpack_gray_bitmap(slot.bitmap)
+        else:
+            pixels = Glyph.unpack_mono_bitmap(slot.bitmap)
         width, height = slot.bitmap.width, slot.bitmap.rows
         top = slot.bitmap_top
         left = slot.bitmap_left
@@ -215,24 +245,63 @@ class Glyph(object):
 
         return data
 
+    @staticmethod
+    def unpack_gray_bitmap(bitmap):
+        """
+        Copy a freetype 8 bit grayscale glyph bitmap into a bytearray where
+        each pixel is represented by a single byte, dropping the row padding.
+        """
+        data = bytearray(bitmap.rows * bitmap.width)
+        for y in range(bitmap.rows):
+            row = y * bitmap.pitch
+            data[y * bitmap.width:(y + 1) * bitmap.width] = bytes(
+                bitmap.buffer[row:row + bitmap.width])
+
+        return data
+
 
 class Font(object):
-    def __init__(self, filename, width, height):
+    def __init__(self, filename, width, height, bpp=1):
         self.face = freetype.Face(filename)
         self.face.set_pixel_sizes(width, height)
+        self.bpp = bpp
 
     def glyph_for_character(self, char):
         # Let FreeType load the glyph for the given character and tell it to
-        # render a monochromatic bitmap representation.
-        self.face.load_char(
-            char, freetype.FT_LOAD_RENDER | freetype.FT_LOAD_TARGET_MONO)
+        # render a monochromatic bitmap representation, or an anti-aliased
+        # grayscale bitmap if more than one bit per pixel is used.
+        if self.bpp == 1:
+            self.face.load_char(
+                char, freetype.FT_LOAD_RENDER | freetype.FT_LOAD_TARGET_MONO)
+        else:
+            self.face.load_char(char, freetype.FT_LOAD_RENDER)
 
-        return Glyph.from_glyphslot(self.face.glyph)
+        return Glyph.from_glyphslot(self.face.glyph, self.bpp > 1)
 
     def render_character(self, char):
         glyph = self.glyph_for_character(char)
         return glyph.bitmap
 
+    def kerning_pairs(self, text):
+        """
+        Return a sorted list of (left, right, adjustment) tuples for each pair
+        of characters in `text` that the font kerns, where left and right are
+        indexes into `text` and adjustment is in whole pixels.
+        """
+        pairs = []
+        if not self.face.has_kerning:
+            return pairs
+
+        for left, left_char in enumerate(text):
+            for right, right_char in enumerate(text):
+                kerning = self.face.get_kerning(left_char, right_char)
+                adjustment = round(kerning.x / 64)
+                if adjustment:
+                    pairs.append(
+                        (left, right, max(-128, min(127, adjustment))))
+
+        return pairs
+
     def text_dimensions(self, text):
         """
         Return (width, height, baseline) of `text` rendered in the current
@@ -261,15 +330,19 @@ class Font(object):
         height = max_ascent + max_descent
         return (width, height, max_descent)
 
-    def write_python(self, text, font_file):
+    def convert(self, text, bounding_boxes=False, kerning=False):
         """
-        Render the given `text` into a python bitmap module.
+        Render the given `text` and return a dictionary of the font data. If
+        bounding_boxes is True only the pixels inside the bounding box of each
+        glyph are stored and the boxes are returned in bboxes. If kerning is
+        True the kerning pairs of the font are returned in kerning.
         """
         _, height, baseline = self.text_dimensions(text)
 
         bits = []
         widths = []
         offsets = []
+        bboxes = []
         offset = 0
 
         for char in text:
@@ -302,18 +375,65 @@ class Font(object):
             outbuffer.bitblt(glyph.bitmap, left, y)
 
             # convert bitmap to ascii bitmap string
-            bit_string = outbuffer.bit_string()
+            if bounding_boxes:
+                bbox = outbuffer.bounding_box()
+                bboxes.extend(bbox)
+                bit_string = outbuffer.bit_string(*bbox, bpp=self.bpp)
+            else:
+                bit_string = outbuffer.bit_string(bpp=self.bpp)
             bits.append(bit_string)
             offset += len(bit_string)
 
         # join all the bitmap strings together
         bit_string = ''.join(bits)
 
+        # each kerning pair is stored as the left and right MAP indexes
+        # followed by a signed byte adjustment, sorted for a binary search.
+        pairs = self.kerning_pairs(text) if kerning else []
+        index_width = 1 if len(text) <= 256 else 2
+        kerning_bytes = bytearray()
+        for left, right, adjustment in pairs:
+            kerning_bytes.extend(left.to_bytes(index_width, 'big'))
+            kerning_bytes.extend(right.to_bytes(index_width, 'big'))
+            kerning_bytes.append(adjustment & 0xff)
+
+        byte_offsets = bytearray()
+        bytes_table = [0xff, 0xffff, 0xffffff, 0xffffffff]
+        bytes_required = bisect.bisect_left(bytes_table, offset, 0, 3) + 1
+        for offset in offsets:
+            byte_offsets.extend(offset.to_bytes(bytes_required, 'big'))
+
+        byte_values = bytearray()
+        for i in range(0, len(bit_string), 8):
+            byte_values.append(int(bit_string[i:i+8].ljust(8, '0'), 2))
+
+        return {
+            'height': height,
+            'baseline': height - baseline,
+            'max_width': max(widths),
+            'widths': bytes(widths),
+            'bboxes': bytes(bboxes) if bounding_boxes else None,
+            'kerning_width': index_width if pairs else 0,
+            'kerning': bytes(kerning_bytes),
+            'offset_width': bytes_required,
+            'offsets': bytes(byte_offsets),
+            'bitmaps': bytes(byte_values),
+        }
+
+    def write_python(self, text, font_file, bounding_boxes=False,
+                     kerning=False):
+        """
+        Render the given `text` into a python bitmap module. If
+        bounding_boxes is True only the pixels inside the bounding box of each
+        glyph are stored and the boxes are written to BBOXES. If kerning is
+        True the kerning pairs of the font are written to KERNING.
+        """
+        font = self.convert(text, bounding_boxes, kerning)
+
         # escape '\' and '"' characters for char_map
         char_map = text.replace('\\', '\\\\').replace('"', '\\"')
 
         cmd_line = " ".join(map(shlex.quote, sys.argv))
-        max_width = max(widths)
 
         # write python module source
         print('# -*- coding: utf-8 -*-')
@@ -321,34 +441,71 @@ class Font(object):
         print(f'#     {cmd_line}')
         print()
         print(f'MAP = "{char_map}"')
-        print('BPP = 1')
-        print(f'HEIGHT = {height}')
-        print(f'MAX_WIDTH = {max_width}')
+        print(f'BPP = {self.bpp}')
+        print(f'HEIGHT = {font["height"]}')
+        print(f'MAX_WIDTH = {font["max_width"]}')
+        print(f'BASELINE = {font["baseline"]}')
         print('_WIDTHS = \\')
-        print(wrap_bytes(widths))
+        print(wrap_bytes(font['widths']))
         print()
 
-        byte_offsets = bytearray()
-        bytes_table = [0xff, 0xffff, 0xffffff, 0xffffffff]
-        bytes_required = bisect.bisect_left(bytes_table, offset, 0, 3) + 1
-        for offset in offsets:
-            byte_offsets.extend(offset.to_bytes(bytes_required, 'big'))
+        if font['bboxes'] is not None:
+            print('_BBOXES = \\')
+            print(wrap_bytes(font['bboxes']))
+            print()
+
+        if font['kerning']:
+            print(f'KERNING_WIDTH = {font["kerning_width"]}')
+            print('_KERNING = \\')
+            print(wrap_bytes(font['kerning']))
+            print()
 
-        print(f'OFFSET_WIDTH = {bytes_required}')
+        print(f'OFFSET_WIDTH = {font["offset_width"]}')
         print('_OFFSETS = \\')
-        print(wrap_longs(byte_offsets))
+        print(wrap_longs(font['offsets']))
         print()
 
         print('_BITMAPS =\\')
-        byte_values = []
-        for i in range(0, len(bit_string), 8):
-            byte_values.append(int(bit_string[i:i+8], 2))
-
-        print(wrap_bytes(byte_values))
+        print(wrap_bytes(font['bitmaps']))
         print("\nWIDTHS = memoryview(_WIDTHS)")
+        if font['bboxes'] is not None:
+            print("BBOXES = memoryview(_BBOXES)")
+        if font['kerning']:
+            print("KERNING = memoryview(_KERNING)")
         print("OFFSETS = memoryview(_OFFSETS)")
         print("BITMAPS = memoryview(_BITMAPS)")
 
+    def write_binary(self, text, output, bounding_boxes=False, kerning=False):
+        """
+        Render the given `text` into a binary font file for the BinaryFont
+        class of the driver. The file holds a header followed by the MAP,
+        WIDTHS, OFFSETS, BBOXES, KERNING and BITMAPS data of the font.
+        """
+        font = self.convert(text, bounding_boxes, kerning)
+        char_map = text.encode('utf-8')
+
+        output.write(struct.pack(
+            '<4sBBBBHHHHII',
+            b'WTFT',
+            self.bpp,
+            font['offset_width'],
+            font['bboxes'] is not None,
+            font['kerning_width'],
+            font['height'],
+            font['max_width'],
+            font['baseline'],
+            len(text),
+            len(char_map),
+            len(font['kerning'])))
+
+        output.write(char_map)
+        output.write(font['widths'])
+        output.write(font['offsets'])
+        if font['bboxes'] is not None:
+            output.write(font['bboxes'])
+        output.write(font['kerning'])
+        output.write(font['bitmaps'])
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -373,6 +530,32 @@ def main():
         default=None,
         help='width of font to create bitmaps from.')
 
+    parser.add_argument(
+        '-p', '--bpp',
+        type=int,
+        choices=(1, 2, 4),
+        default=1,
+        help='''bits per pixel, 2 or 4 bits per pixel store anti-aliased
+        glyphs.''')
+
+    parser.add_argument(
+        '-b', '--bounding-boxes',
+        action='store_true',
+        help='''only store the pixels inside the bounding box of each glyph
+        and write the boxes to BBOXES.''')
+
+    parser.add_argument(
+        '-k', '--kerning',
+        action='store_true',
+        help='''write the kerning pairs of the selected characters to
+        KERNING.''')
+
+    parser.add_argument(
+        '-B', '--binary',
+        action='store_true',
+        help='''write a binary font file for the BinaryFont class of the
+        driver instead of a python module.''')
+
     group = parser.add_argument_group(
         'character selection',
         'characters from the font to include in the bitmap.')
@@ -395,8 +578,13 @@ def main():
     characters = (
         get_chars(args.characters) if args.string is None else args.string)
 
-    fnt = Font(font_file, width, height)
-    fnt.write_python(characters, font_file)
+    fnt = Font(font_file, width, height, args.bpp)
+    if args.binary:
+        fnt.write_binary(
+            characters, sys.stdout.buffer, args.bounding_boxes, args.kerning)
+    else:
+        fnt.write_python(
+            characters, font_file, args.bounding_boxes, args.kerning)
 
 
 main()
@@ -5,7 +5,9 @@ https://github.com/spacerace/romfont repo.
 
 Reads all romfont bin files from the specified -input-directory (-i) and writes
 python font files to the specified -output-directory (-o).  Optionally limiting
-characters included to -first-char (-f) thru -last-char (-l).
+characters included to -first-char (-f) thru -last-char (-l). The -binary (-b)
+option writes binary font files for the BinaryFont class of the driver instead
+of python font files.
 
 Example:
 
@@ -15,6 +17,7 @@ requires argparse
 """
 import os
 import re
+import struct
 import argparse
 
 def convert_font(file_in, file_out, width, height, first=0x0, last=0xff):
@@ -41,6 +44,15 @@ def convert_font(file_in, file_out, width, height, first=0x0, last=0xff):
             print('', file=font_file)
             print('FONT = memoryview(_FONT)', file=font_file)
 
+def convert_font_binary(file_in, file_out, width, height, first=0x0, last=0xff):
+    chunk_size = height * ((width + 7) // 8)
+    with open(file_in, "rb") as bin_file:
+        bin_file.seek(first * chunk_size)
+        with open(file_out, 'wb') as font_file:
+            font_file.write(
+                struct.pack('<4sBBHH', b'WTFR', width, height, first, last))
+            font_file.write(bin_file.read((last - first + 1) * chunk_size))
+
 def auto_int(x):
         return int(x, 0)
 
@@ -52,6 +64,8 @@ def main():
     parser.add_argument('output', help='file or directory to contain python font file(s).')
     parser.add_argument('-f', '--first-char', type=auto_int, default=0x20)
     parser.add_argument('-l', '--last-char', type=auto_int, default=0x7f)
+    parser.add_argument('-b', '--binary', action='store_true',
+        help='write binary font files for the BinaryFont class.')
     args = parser.parse_args()
 
     file_re = re.compile(r'^(.*)(\d+)x(\d+)\.bin$')
@@ -73,15 +87,17 @@ def main():
 
             if is_dir:
                 font_file_name = (
-                    args.font_directory + '/' +
+                    args.output + '/' +
                     match.group(1).rstrip('_').lower()+
-                    f'_{font_width}x{font_height}.py')
+                    f'_{font_width}x{font_height}' +
+                    ('.fnt' if args.binary else '.py'))
             else:
                 font_file_name = args.output
 
             print("converting", bin_file_name, 'to', font_file_name)
 
-            convert_font(
+            convert = convert_font_binary if args.binary else convert_font
+            convert(
                 bin_file_name,
                 font_file_name,
                 font_width,
@@ -25,6 +25,10 @@ since only one 1 bit of the register is ever set or cleared. This could be optim
 by stealing another unused bit in the GPIO_OUT_W1TS_MASK table.  I left it as is
 to make it easier to understand and modify for other displays.
 
+The driver now builds these tables into arrays when it is initialized using the
+data_pins argument, caching them in flash after the first boot, so this script
+is only needed to inspect the masks for a pin map.
+
 """
 
 GPIO_OUT_W1TS_REG = 0x60004008
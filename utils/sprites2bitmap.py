@@ -13,12 +13,164 @@
         ... tft config and init code ...
         tft.bitmap(sprites, x, y, index)
 
+    Use the --raw565 option to write the sprites as RGB565 pixels in the byte
+    order sent to the display, ready to be drawn without decoding, and the
+    --bin option to write the raw pixels to a binary file. Each sprite in the
+    binary file is sprite_width * sprite_height * 2 bytes long and can be
+    drawn using blit_file with the offset of the sprite.
+
+    Usage:
+        sprites2bitmap --raw565 image_file sprite_width sprite_height >sprites.py
+        sprites2bitmap --raw565 --bin image_file sprite_width sprite_height >sprites.bin
+
+    Use the --rle option to compress the palette indexes of the pixels using
+    PackBits run length encoding. Sprites with large areas of the same color
+    take less flash and draw faster. OFFSETS holds the position of each
+    sprite in BITMAP.
+
+    Usage:
+        sprites2bitmap --rle image_file sprite_width sprite_height bits_per_pixel >sprites.py
+
+    Use the --transparent option to make the palette color closest to the
+    given RGB color transparent. Transparent pixels are not drawn, so sprites
+    can be drawn over any background.
+
+    Usage:
+        sprites2bitmap --transparent 0x000000 image_file sprite_width sprite_height bits_per_pixel >sprites.py
+
 '''
 
+import sys
 from os import setpriority
 from PIL import Image
 import argparse
 
+
+def print_raw565(img, sprite_width, sprite_height, binary=False):
+    '''
+    Write the sprites as big endian RGB565 pixels, either as python source for
+    a bitmap module or as raw binary data.
+    '''
+    img = img.convert("RGB")
+    pixels = bytearray()
+    bitmaps = 0
+    for y in range(0, img.height, sprite_height):
+        for x in range(0, img.width, sprite_width):
+            bitmaps += 1
+            for yy in range(y, y + sprite_height):
+                for xx in range(x, x + sprite_width):
+                    red, green, blue = img.getpixel((xx, yy))
+                    color = (red & 0xF8) << 8 | (green & 0xFC) << 3 | blue >> 3
+                    pixels.extend(color.to_bytes(2, 'big'))
+
+    if binary:
+        sys.stdout.buffer.write(pixels)
+        return
+
+    print(f'BITMAPS = {bitmaps}')
+    print(f'HEIGHT = {sprite_height}')
+    print(f'WIDTH = {sprite_width}')
+    print('BPP = 16')
+    print("_bitmap =\\", sep='')
+    print("b'", sep='', end='')
+
+    for i, value in enumerate(pixels):
+        if i and i % 16 == 0:
+            print("'\\\nb'", end='', sep='')
+
+        print(f'\\x{value:02x}', sep='', end='')
+
+    print("'\nBITMAP = memoryview(_bitmap)")
+
+
+def closest_color(palette, colors, rgb):
+    '''
+    Return the index of the palette color closest to the 24 bit rgb color.
+    '''
+    red, green, blue = rgb >> 16, (rgb >> 8) & 0xFF, rgb & 0xFF
+    return min(
+        range(colors),
+        key=lambda i: (
+            (palette[i*3] - red) ** 2
+            + (palette[i*3+1] - green) ** 2
+            + (palette[i*3+2] - blue) ** 2))
+
+
+def packbits(data):
+    '''
+    Compress a sequence of bytes using PackBits run length encoding. A header
+    byte n of 0 to 127 is followed by n + 1 literal bytes, a header byte n of
+    129 to 255 is followed by one byte to be repeated 257 - n times.
+    '''
+    packed = bytearray()
+    i = 0
+    length = len(data)
+    while i < length:
+        run = 1
+        while i + run < length and run < 128 and data[i + run] == data[i]:
+            run += 1
+
+        if run > 1:
+            packed.append(257 - run)
+            packed.append(data[i])
+            i += run
+            continue
+
+        start = i
+        while i < length and i - start < 128:
+            if i + 1 < length and data[i] == data[i + 1]:
+                break
+            i += 1
+
+        packed.append(i - start - 1)
+        packed.extend(data[start:i])
+
+    return packed
+
+
+def print_rle(img, sprite_width, sprite_height, bits, colors, transparent=None):
+    '''
+    Write the sprites as python source for a bitmap module with the palette
+    indexes of the pixels of each sprite compressed using PackBits run length
+    encoding.
+    '''
+    packed = bytearray()
+    offsets = [0]
+    for y in range(0, img.height, sprite_height):
+        for x in range(0, img.width, sprite_width):
+            indexes = bytes(
+                img.getpixel((xx, yy))
+                for yy in range(y, y + sprite_height)
+                for xx in range(x, x + sprite_width))
+            packed.extend(packbits(indexes))
+            offsets.append(len(packed))
+
+    print(f'BITMAPS = {len(offsets) - 1}')
+    print(f'HEIGHT = {sprite_height}')
+    print(f'WIDTH = {sprite_width}')
+    print(f'COLORS = {1 << bits}')
+    print(f'BPP = {bits}')
+    print('RLE = True')
+    if transparent is not None:
+        print(f'TRANSPARENT = {transparent}')
+    print('PALETTE = [', sep='', end='')
+    print(','.join(f'0x{rgb}' for rgb in colors), end='')
+    print("]")
+    print('OFFSETS = [', sep='', end='')
+    print(','.join(str(offset) for offset in offsets), end='')
+    print("]")
+    print("_bitmap =\\", sep='')
+    print("b'", sep='', end='')
+
+    for i, value in enumerate(packed):
+        if i and i % 16 == 0:
+            print("'\\\nb'", end='', sep='')
+
+        print(f'\\x{value:02x}', sep='', end='')
+
+    print("'\nBITMAP = memoryview(_bitmap)")
+
+
 def main():
 
     parser = argparse.ArgumentParser(
@@ -42,15 +194,50 @@ def main():
     parser.add_argument(
         'bits_per_pixel',
         type=int,
+        nargs='?',
         choices=range(1, 9),
         default=1,
         metavar='bits_per_pixel',
         help='The number of bits to use per pixel (1..8)')
 
+    parser.add_argument(
+        '-r', '--raw565',
+        action='store_true',
+        help='write RGB565 pixels ready to send to the display')
+
+    parser.add_argument(
+        '-b', '--bin',
+        action='store_true',
+        help='write the RGB565 pixels as binary data, requires --raw565')
+
+    parser.add_argument(
+        '-l', '--rle',
+        action='store_true',
+        help='compress the palette indexes using run length encoding')
+
+    parser.add_argument(
+        '-t', '--transparent',
+        type=lambda value: int(value, 0),
+        metavar='RGB',
+        help='make the palette color closest to RGB (for example 0x000000) transparent')
+
     args = parser.parse_args()
 
-    bits = args.bits_per_pixel
+    if args.transparent is not None and args.raw565:
+        parser.error('--transparent can not be used with --raw565')
+
+    if args.rle and args.raw565:
+        parser.error('--rle can not be used with --raw565')
+
+    if args.bin and not args.raw565:
+        parser.error('--bin requires --raw565')
+
     img = Image.open(args.image_file)
+    if args.raw565:
+        print_raw565(img, args.sprite_width, args.sprite_height, args.bin)
+        return
+
+    bits = args.bits_per_pixel
     img = img.convert("P", palette=Image.ADAPTIVE, colors=2**bits)
     palette = img.getpalette()  # Make copy of palette colors
 
@@ -70,6 +257,15 @@ def main():
         # append byte swapped 565 color to colors
         colors.append(f'{color:04x}')
 
+    transparent = None
+    if args.transparent is not None:
+        transparent = closest_color(palette, 1 << bits, args.transparent)
+
+    if args.rle:
+        print_rle(
+            img, args.sprite_width, args.sprite_height, bits, colors, transparent)
+        return
+
     image_bitstring = ''
     max_colors = 1 << bits
     bitmaps = 0
@@ -94,6 +290,8 @@ def main():
     print(f'COLORS = {max_colors}')
     print(f'BITS = {bitmap_bits}')
     print(f'BPP = {bits}')
+    if transparent is not None:
+        print(f'TRANSPARENT = {transparent}')
     print('PALETTE = [', sep='', end='')
 
     for color, rgb in enumerate(colors):